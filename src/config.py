@@ -1,4 +1,5 @@
 # src/config.py
+import os
 from pathlib import Path
 
 class Config:
@@ -11,8 +12,17 @@ class Config:
     INPUT_DIR = BASE_DIR / "data" / "input"
     OUTPUT_DIR = BASE_DIR / "data" / "output"
     
+    # 변환 결과 캐시 폴더명 (OUTPUT_DIR 하위)
+    CACHE_DIR_NAME = ".cache"
+
+    # 창을 띄울 수 없는 환경(Agg 등)에서 시각화 이미지를 저장할 폴더명 (OUTPUT_DIR 하위)
+    PLOT_DIR_NAME = "plots"
+    
     # 처리 대상 파일 패턴
     FILE_PATTERN = "*.json"
     
     # 인코딩 설정
-    ENCODING = "utf-8"
\ No newline at end of file
+    ENCODING = "utf-8"
+
+    # 병렬 처리 기본 프로세스 수 (max_workers=None일 때, 변환/시각화 공통): CPU 코어 수의 절반
+    DEFAULT_MAX_WORKERS = max(1, (os.cpu_count() or 2) // 2)
\ No newline at end of file
@@ -45,13 +45,20 @@ def main():
     # 2. 병합 오차율 설정 (0.01 = 1%)
     # 분석 결과 추천값: 0.03 (3%)
     MERGE_TOLERANCE = 0.03
+    # 3. 파일 병렬 처리 프로세스 수 (None = CPU 코어 수의 절반, 1 = 순차 처리)
+    MAX_WORKERS = None
+    # 4. 변환 결과 캐시 사용 여부 (입력 파일/설정이 같으면 이전 결과 재사용)
+    # 캐시는 data/output/.cache 의 pickle 파일을 그대로 로드하므로, 직접 만든 신뢰할 수 있는 폴더에서만 True로 사용
+    USE_CACHE = False
 
     # ==========================================
     
     # 설정값을 Processor에 전달
     processor = BatchProcessor(
         enable_merge=ENABLE_MERGE, 
-        merge_tolerance=MERGE_TOLERANCE
+        merge_tolerance=MERGE_TOLERANCE,
+        max_workers=MAX_WORKERS,
+        use_cache=USE_CACHE
     )
     processor.run()
     
@@ -1,15 +1,31 @@
 # src/processors/converters/batch_processor.py
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from pathlib import Path
+from typing import Optional
 from src.config import Config
-from src.utils import JsonHandler, measure_time, Log
+from src.utils import JsonHandler, measure_time, Log, ResultCache
+from src.utils import file_manager
+from . import data_modifier, geometry_merger
 from .data_modifier import DataModifier
 
+# 캐시 무효화 기준이 되는 변환 로직 모듈 (JSON 읽기/정제 포함)
+_CACHE_SOURCE_MODULES = (data_modifier, geometry_merger, file_manager)
+
 class BatchProcessor:
     """
     배치 처리 관리자
     """
 
-    def __init__(self, enable_merge: bool = True, merge_tolerance: float = 0.01):
+    def __init__(self, enable_merge: bool = True, merge_tolerance: float = 0.01, max_workers: Optional[int] = None,
+                 use_cache: bool = False):
+        self.enable_merge = enable_merge
+        self.merge_tolerance = merge_tolerance
+        # 파일 단위 병렬 처리 프로세스 수 (None이면 Config.DEFAULT_MAX_WORKERS)
+        self.max_workers = max_workers or Config.DEFAULT_MAX_WORKERS
+        # 입력 파일/설정이 바뀌지 않았다면 이전 변환 결과를 재사용 (pickle 캐시이므로 신뢰할 수 있는 출력 폴더에서만 사용)
+        self.use_cache = use_cache
+        self.cache = ResultCache(Config.OUTPUT_DIR / Config.CACHE_DIR_NAME, "conv", _CACHE_SOURCE_MODULES)
         self.io = JsonHandler()
         self.modifier = DataModifier(
             enable_merge=enable_merge, 
@@ -25,8 +41,21 @@ class BatchProcessor:
             Log.warning("No JSON files found in input directory.")
             return
 
-        for filepath in files:
-            self._process_single_file(filepath)
+        workers = min(self.max_workers, len(files))
+        if workers <= 1:
+            for filepath in files:
+                self._process_single_file(filepath)
+        else:
+            # 파일 간 의존성이 없으므로 프로세스 풀로 병렬 처리
+            # 워커 로그는 파일별로 모아 두었다가 입력 순서대로 출력 (여러 파일의 로그가 섞이지 않도록)
+            Log.info(f"Processing {len(files)} files with {workers} workers.")
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                for file_log in executor.map(
+                    _process_file_worker, files,
+                    repeat(self.enable_merge), repeat(self.merge_tolerance), repeat(self.use_cache),
+                    chunksize=1
+                ):
+                    print(file_log, end='')
             
         Log.section(f"Processing Complete. Total files: {len(files)}")
 
@@ -34,11 +63,21 @@ class BatchProcessor:
     def _process_single_file(self, filepath: Path):
         print(f"\nProcessing: {filepath.name}...")
         
-        data = self.io.read_json(filepath)
-        if not data:
-            return
+        # 캐시 키: 입력 파일 + Modifier 설정 + 변환 모듈 소스
+        cache_path = self.cache.path_for(filepath, self.enable_merge, self.merge_tolerance) if self.use_cache else None
+        result = self.cache.load(cache_path) if cache_path else None
+
+        if result is None:
+            data = self.io.read_json(filepath)
+            if not data:
+                return
+            result = self.modifier.process(data)
+            if cache_path:
+                self.cache.save(cache_path, result)
+        else:
+            Log.info(f"-> Cache hit. Reusing previous result ({filepath.name})")
 
-        valid_data, deleted_data = self.modifier.process(data)
+        valid_data, deleted_data = result
 
         # 1. 정상 데이터 저장
         new_filename = f"{filepath.stem}_Unity{filepath.suffix}"
@@ -59,4 +98,12 @@ class BatchProcessor:
             
             Log.info(f"-> Deleted items saved to: {deleted_filename} (Count: {len(deleted_data)})")
         
-        Log.info(f"-> Valid items saved to: {new_filename} (Count: {len(valid_data)})")
\ No newline at end of file
+        Log.info(f"-> Valid items saved to: {new_filename} (Count: {len(valid_data)})")
+
+
+def _process_file_worker(filepath: Path, enable_merge: bool, merge_tolerance: float, use_cache: bool) -> str:
+    """프로세스 풀 작업 단위. 워커 프로세스마다 독립된 BatchProcessor를 생성하고, 이 파일의 로그 출력을 반환합니다."""
+    processor = BatchProcessor(enable_merge=enable_merge, merge_tolerance=merge_tolerance, max_workers=1,
+                               use_cache=use_cache)
+    _, file_log = Log.run_buffered(processor._process_single_file, filepath)
+    return file_log
@@ -1,7 +1,7 @@
 # src/processors/converters/data_modifier.py
 import re
-from typing import Dict, Any, Tuple
-from collections import defaultdict
+import sys
+from typing import Dict, Any, Tuple, Optional, Set
 from src.utils import Log, log_lifecycle
 from .geometry_merger import GeometryMerger
 
@@ -10,9 +10,36 @@ class DataModifier:
     데이터 변환, 표준화, 검증 및 형상 최적화를 수행합니다.
     """
 
+    # 하위 부재명 목록 (정규식 alternation 순서). 키 파싱 패턴과 표준 표기가 모두 여기서 생성됨
+    PART_TYPES = ("Bot", "Right", "Left", "BackSide", "Flange", "FrontSide")
+    # 부재명 표준 표기 (Flange는 원문 표기 유지)
+    PART_TYPE_NAMES = {t.lower(): t for t in PART_TYPES if t != "Flange"}
+
+    # 하위 부재 키 분류 비트. 키 문자열 검사는 그룹에 삽입할 때 한 번만 수행
+    PART_RIGHT, PART_LEFT, PART_BOT, PART_BACKSIDE, PART_FRONTSIDE, PART_FLANGE = 1, 2, 4, 8, 16, 32
+    PART_FLAG_TOKENS = (
+        ("_Right_", PART_RIGHT), ("_Left_", PART_LEFT), ("_Bot_", PART_BOT),
+        ("_BackSide_", PART_BACKSIDE), ("_FrontSide_", PART_FRONTSIDE), ("_Flange", PART_FLANGE),
+    )
+    # 최종 검사에서 복잡 형상으로 인정하는 부재 토큰 (병합으로 새로 생긴 키도 검사하므로 문자열 기준)
+    COMPLEX_PART_TOKENS = ("_Right_", "_Left_", "_FrontSide_")
+
     def __init__(self, enable_merge: bool = True, merge_tolerance: float = 0.01):
-        self.longi_id_pattern = re.compile(r"Longi_.*?(\d+)") 
-        self.part_type_pattern = re.compile(r"_(Bot|Right|Left|BackSide|Flange|FrontSide)(?:_|$)", re.IGNORECASE)
+        # 'Longi_' 뒤 첫 숫자열 (Longi_.*?(\d+) 와 동일한 매치, 부정 문자 클래스로 lazy 백트래킹 제거)
+        self.longi_id_pattern = re.compile(r"Longi_[^\d\n]*(\d+)") 
+        # 부재명과 바로 뒤의 하위 번호(선택)를 한 번의 검색으로 추출
+        self.part_type_pattern = re.compile(
+            r"_(" + "|".join(self.PART_TYPES) + r")(?:_|$)(?:[:_]?(\d+)(?:_|$))?", re.IGNORECASE
+        )
+        # 키마다 반복 사용되는 패턴은 생성 시 한 번만 컴파일
+        self.unique_key_pattern = re.compile(r"^(Longi_\d+_[A-Za-z]+_)(\d+)(.*)$")
+        self.trailing_num_pattern = re.compile(r"(\d+)$")
+        # Standard_/Stiffener_ 접두사를 선택 그룹으로 둔 단일 Surface 패턴 (Plane 키 변환용)
+        self.surface_pattern = re.compile(r"(?:(?P<standard>Standard_)|(?P<stiffener>Stiffener_))?Surface_(?P<num>\d+)", re.IGNORECASE)
+        # 하위 키 접미사 (그룹 번호: 1=Flange, 2=UpSide, 3=DownSide) 를 한 번의 스캔으로 검출
+        self.suffix_pattern = re.compile(r"(flange)|(upside)|(downside)", re.IGNORECASE)
+        # raw 하위 키 -> 표준 키 꼬리부 ('Bot_001_Flange' 등)
+        self._sub_key_tails = {}
         
         self.enable_merge = enable_merge
         self.merger = GeometryMerger(norm_tol=merge_tolerance, dist_tol=merge_tolerance)
@@ -20,7 +47,8 @@ class DataModifier:
     @log_lifecycle
     def process(self, data: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
         # [Step 1] 전처리
-        grouped_longis, plane_candidates = self._transform_and_aggregate(data)
+        self.merger.clear_cache()
+        grouped_longis, longi_flags, plane_candidates = self._transform_and_aggregate(data)
         
         valid_data = {}
         deleted_data = {}
@@ -28,11 +56,11 @@ class DataModifier:
         # [Step 2] Longi 계열 후처리
         for main_key, sub_items in grouped_longis.items():
             # 2-1. 1차 유효성 검사 (필수 부재 확인 및 복잡도 제한)
-            is_valid, reason = self._validate_longi_group(main_key, sub_items)
+            is_valid, reason = self._validate_longi_group(main_key, longi_flags[main_key])
             
             if is_valid:
                 # 2-2. 최적화 (BackSide/FrontSide 각각 병합)
-                optimized_items = self._optimize_longi_geometry(main_key, sub_items)
+                optimized_items = self._optimize_longi_geometry(main_key, sub_items, longi_flags[main_key])
                 
                 # 2-3. 최종 형상 검사 (최적화 후 단순 형상 필터링)
                 is_final_valid, final_reason = self._validate_final_geometry(main_key, optimized_items)
@@ -50,131 +78,188 @@ class DataModifier:
         if plane_candidates:
             if self.enable_merge:
                 Log.info(f"Merging Plane group (Count: {len(plane_candidates)})...")
-                merged_planes = self.merger.merge_planes(plane_candidates)
-                valid_data.update(merged_planes)
+                # 병합 결과를 중간 dict 없이 valid_data에 바로 기록
+                self.merger.merge_planes(plane_candidates, out=valid_data)
             else:
                 for key, val in plane_candidates.items():
                     self._process_plane_item(key, val, valid_data)
 
         return valid_data, deleted_data
 
-    def _transform_and_aggregate(self, data: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
-        longi_groups = defaultdict(dict)
+    def _transform_and_aggregate(self, data: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Dict[str, int]], Dict[str, Any]]:
+        """반환값: (Longi 그룹, Longi 그룹별 하위 키 분류 비트, Plane 후보)"""
+        longi_groups = {}
+        longi_flags = {}
+        # Longi 그룹별 중복 키 탐색 위치 (같은 base 키가 반복될 때 이미 사용된 번호를 건너뜀)
+        dup_hints = {}
         plane_candidates = {}
 
+        # 1. 키만 보고 Longi(ID 있음) / Plane 으로 분할 (각 목록의 원래 순서 유지)
+        longi_items = []
         for key, value in data.items():
             if not value: continue
+            match = self.longi_id_pattern.search(key) if key.startswith("Longi") else None
+            if match:
+                longi_items.append((key, value, match.group(1), match.end()))
+            else:
+                plane_candidates[key] = value
+
+        # 2. 좌표 변환 (제자리 수정). Longi 값은 하위 부재 컨테이너 여부도 함께 판별
+        # 같은 dict/list가 여러 곳에서 참조되더라도 한 번만 순회하도록 방문 id를 호출 간 공유
+        transform = self._transform_vertices
+        visited = set()
+        for value in plane_candidates.values():
+            transform(value, visited)
+        longi_containers = [transform(value, visited) for _, value, _, _ in longi_items]
+
+        # 3. Longi: 그룹화 + 하위 키 표준화 (Vertex 값은 이미 변환된 dict로 교체됨)
+        # 루프 내 속성 조회를 줄이기 위해 메서드를 지역 이름으로 바인딩
+        generate_sub_key = self._generate_standard_sub_key
+        get_unique_key = self._get_unique_key
+        part_flags = self._part_flags
+        # raw Longi ID -> (하위 키 접두사 'Longi_NNN_', 그룹 dict, 분류 비트 dict, 중복 키 탐색 위치 dict)
+        longi_state = {}
+
+        def insert(group, flags, hints, raw_key, prefix, value, id_end=None):
+            std_sub_key = generate_sub_key(raw_key, prefix, id_end)
+            # 충돌이 없는 일반적인 경우는 멤버십 검사 1회로 끝내고, 충돌 시에만 번호 탐색
+            unique_key = std_sub_key if std_sub_key not in group else get_unique_key(group, std_sub_key, hints)
+            group[unique_key] = value
+            flags[unique_key] = part_flags(unique_key)
+
+        for (key, transformed_val, raw_idx, key_id_end), is_container in zip(longi_items, longi_containers):
+            # 같은 Longi ID는 여러 번 등장하므로 번호 문자열/그룹 키와 그룹별 dict를 한 번만 구해 재사용
+            state = longi_state.get(raw_idx)
+            if state is None:
+                idx_str = f"{int(raw_idx):03d}"
+                main_key = sys.intern(f"Longi_{idx_str}")
+                # 그룹 dict는 처음 등장할 때 한 번만 생성 ('5'와 '05'처럼 다른 raw ID도 같은 그룹을 공유)
+                if main_key not in longi_groups:
+                    longi_groups[main_key] = {}
+                    longi_flags[main_key] = {}
+                    dup_hints[main_key] = {}
+                # 하위 키 접두사도 그룹마다 한 번만 생성하여 삽입마다의 포맷팅을 제거
+                prefix = sys.intern(main_key + "_")
+                state = longi_state[raw_idx] = (prefix, longi_groups[main_key], longi_flags[main_key], dup_hints[main_key])
+            prefix, group, flags, hints = state
             
-            transformed_val = self._transform_recursive(value)
-
-            if key.startswith("Longi"):
-                match = self.longi_id_pattern.search(key)
-                if match:
-                    raw_idx = match.group(1)
-                    idx_str = f"{int(raw_idx):03d}"
-                    main_key = f"Longi_{idx_str}"
-                    
-                    if self._is_container(transformed_val):
-                        for sub_k, sub_v in transformed_val.items():
-                            std_sub_key = self._generate_standard_sub_key(sub_k, idx_str)
-                            unique_key = self._get_unique_key(longi_groups[main_key], std_sub_key)
-                            longi_groups[main_key][unique_key] = sub_v
-                    else:
-                        std_sub_key = self._generate_standard_sub_key(key, idx_str)
-                        unique_key = self._get_unique_key(longi_groups[main_key], std_sub_key)
-                        longi_groups[main_key][unique_key] = transformed_val
-                else:
-                    plane_candidates[key] = transformed_val
+            if is_container:
+                for sub_k, sub_v in transformed_val.items():
+                    insert(group, flags, hints, sub_k, prefix, sub_v)
             else:
-                plane_candidates[key] = transformed_val
+                # 최상위 키의 ID 위치는 분할 단계에서 이미 구했으므로 재검색하지 않음
+                insert(group, flags, hints, key, prefix, transformed_val, key_id_end)
         
-        return longi_groups, plane_candidates
+        return longi_groups, longi_flags, plane_candidates
+
+    def _part_flags(self, sub_key: str) -> int:
+        flags = 0
+        for token, bit in self.PART_FLAG_TOKENS:
+            if token in sub_key: flags |= bit
+        return flags
 
-    def _get_unique_key(self, container: Dict[str, Any], base_key: str) -> str:
+    def _get_unique_key(self, container: Dict[str, Any], base_key: str, probe_hints: Dict[str, int] = None) -> str:
+        """
+        container에 없는 키를 반환합니다. (번호 증가 또는 _dup_N 접미사)
+        probe_hints: base_key별 직전 반환 번호. 키는 삭제되지 않으므로 그 이하 번호는 다시 탐색하지 않음
+        """
         if base_key not in container:
             return base_key
 
-        match = re.match(r"^(Longi_\d+_[A-Za-z]+_)(\d+)(.*)$", base_key)
+        match = self.unique_key_pattern.match(base_key)
         if match:
             prefix = match.group(1)
             current_num = int(match.group(2))
             suffix = match.group(3)
+            if probe_hints is not None:
+                current_num = max(current_num, probe_hints.get(base_key, current_num))
             while True:
                 current_num += 1
                 new_key = f"{prefix}{current_num:03d}{suffix}"
                 if new_key not in container:
+                    if probe_hints is not None: probe_hints[base_key] = current_num
                     return new_key
         
         dup_count = 1
+        if probe_hints is not None:
+            dup_count = probe_hints.get(base_key, 0) + 1
         new_key = f"{base_key}_dup_{dup_count}"
         while new_key in container:
             dup_count += 1
             new_key = f"{base_key}_dup_{dup_count}"
+        if probe_hints is not None: probe_hints[base_key] = dup_count
         return new_key
 
-    def _is_container(self, value: Any) -> bool:
-        if not isinstance(value, dict): return False
-        if any("Vertex" in k for k in value.keys()): return False
-        return True
+    def _generate_standard_sub_key(self, raw_key: str, prefix: str, id_end: int = None) -> str:
+        """prefix: 그룹별로 미리 만든 'Longi_{번호}_' 접두사"""
+        # 부재명/번호/접미사는 raw_key에만 의존하므로 파싱 결과를 재사용 (Longi 그룹마다 같은 하위 키가 반복됨)
+        tail = self._sub_key_tails.get(raw_key)
+        if tail is None:
+            tail = self._sub_key_tails[raw_key] = sys.intern(self._parse_sub_key_tail(raw_key, id_end))
+        # 같은 표준 키가 그룹/분류 비트/출력 dict에서 반복 사용되므로 intern하여 문자열을 공유
+        return sys.intern(prefix + tail)
 
-    def _generate_standard_sub_key(self, raw_key: str, parent_idx: str) -> str:
-        id_match = self.longi_id_pattern.search(raw_key)
-        search_start_pos = 0
-        if id_match:
-            search_start_pos = id_match.end()
+    def _parse_sub_key_tail(self, raw_key: str, id_end: int = None) -> str:
+        """
+        raw_key에서 '{부재명}_{번호}[_Flange][_UpSide|_DownSide]' 부분을 생성합니다.
+        id_end: 호출 측에서 이미 구한 longi_id_pattern 매치 끝 위치 (없으면 직접 검색)
+        """
+        if id_end is None:
+            id_match = self.longi_id_pattern.search(raw_key)
+            id_end = id_match.end() if id_match else 0
+        search_start_pos = id_end
             
-        target_substring = raw_key[search_start_pos:]
-        
-        match = self.part_type_pattern.search(target_substring)
+        # 슬라이스 없이 ID 뒤부터 검색
+        match = self.part_type_pattern.search(raw_key, search_start_pos)
         part_type = match.group(1) if match else "Part"
         
         sub_idx = "001"
-        if match:
-            post_part = target_substring[match.end():]
-            strict_num_match = re.match(r"^[:_]?(\d+)(?:_|$)", post_part)
-            if strict_num_match:
-                sub_idx = f"{int(strict_num_match.group(1)):03d}"
+        if match and match.group(2):
+            sub_idx = f"{int(match.group(2)):03d}"
         
-        formatted_type = part_type
-        if part_type.lower() == "right": formatted_type = "Right"
-        elif part_type.lower() == "left": formatted_type = "Left"
-        elif part_type.lower() == "bot": formatted_type = "Bot"
-        elif part_type.lower() == "backside": formatted_type = "BackSide"
-        elif part_type.lower() == "frontside": formatted_type = "FrontSide"
+        # 이미 표준 표기인 경우(대부분)는 lower() 없이 그대로 사용
+        if part_type in self.PART_TYPES:
+            formatted_type = part_type
+        else:
+            formatted_type = self.PART_TYPE_NAMES.get(part_type.lower(), part_type)
         
-        base_key = f"Longi_{parent_idx}_{formatted_type}_{sub_idx}"
+        parts = [formatted_type, sub_idx]
 
-        target_lower = target_substring.lower()
-        if "flange" in target_lower and formatted_type != "Flange":
-            base_key += "_Flange"
+        # ID 뒤 접미사를 한 번에 검색 (소문자 변환/슬라이스 없이), 출력 순서는 Flange -> UpSide|DownSide 고정
+        found = {m.lastindex for m in self.suffix_pattern.finditer(raw_key, search_start_pos)}
+        if 1 in found and formatted_type != "Flange":
+            parts.append("Flange")
         
-        if "upside" in target_lower:
-            base_key += "_UpSide"
-        elif "downside" in target_lower:
-            base_key += "_DownSide"
+        if 2 in found:
+            parts.append("UpSide")
+        elif 3 in found:
+            parts.append("DownSide")
         
-        return base_key
+        return "_".join(parts)
 
-    def _validate_longi_group(self, key: str, sub_items: Dict[str, Any]) -> Tuple[bool, str]:
+    def _validate_longi_group(self, key: str, sub_flags: Dict[str, int]) -> Tuple[bool, str]:
         """
         Longi 그룹의 1차 유효성을 검사합니다.
         조건:
         1. Right 또는 Left 부재가 3개 이상이면 복잡 형상으로 간주하여 실패 (Flange 제외)
         2. Bot과 BackSide는 필수 (FrontSide 제외)
         """
-        sub_keys = list(sub_items.keys())
-        
-        # 1. Right/Left 개수 카운트 (Flange 제외)
-        right_keys = [k for k in sub_keys if "_Right_" in k and "_Flange" not in k]
-        left_keys = [k for k in sub_keys if "_Left_" in k and "_Flange" not in k]
+        # 분류 비트를 한 번만 순회하며 Right/Left 개수(Flange 제외)와 필수 컴포넌트 존재를 함께 집계
+        right_count = left_count = 0
+        present = 0
+        for flags in sub_flags.values():
+            if not flags & self.PART_FLANGE:
+                if flags & self.PART_RIGHT: right_count += 1
+                if flags & self.PART_LEFT: left_count += 1
+            present |= flags
+        has_bot = bool(present & self.PART_BOT)
+        has_backside = bool(present & self.PART_BACKSIDE)
         
-        if len(right_keys) >= 3 or len(left_keys) >= 3:
-            return False, f"Complex Shape (Right: {len(right_keys)}, Left: {len(left_keys)})"
+        # 1. Right/Left 개수 검사
+        if right_count >= 3 or left_count >= 3:
+            return False, f"Complex Shape (Right: {right_count}, Left: {left_count})"
 
         # 2. 필수 컴포넌트 체크
-        has_bot = any("_Bot_" in k for k in sub_keys)
-        has_backside = any("_BackSide_" in k for k in sub_keys)
-
         if not (has_bot and has_backside):
             missing = []
             if not has_bot: missing.append("Bot")
@@ -190,11 +275,10 @@ class DataModifier:
         - Bot과 BackSide만 존재하는 단순 형상은 제외합니다.
         - Right, Left, FrontSide 중 하나라도 존재해야 유효합니다.
         """
-        keys = list(data.keys())
-        
         # 복잡 형상을 구성하는 부재(Right, Left, FrontSide)가 하나라도 있는지 확인
+        # 키 목록/토큰 리스트를 따로 만들지 않고 dict를 직접 순회
         has_complex_feature = any(
-            t in k for k in keys for t in ["_Right_", "_Left_", "_FrontSide_"]
+            t in k for k in data for t in self.COMPLEX_PART_TOKENS
         )
         
         if not has_complex_feature:
@@ -202,86 +286,138 @@ class DataModifier:
             
         return True, ""
 
-    def _optimize_longi_geometry(self, longi_key: str, data: Dict[str, Any]) -> Dict[str, Any]:
+    def _optimize_longi_geometry(self, longi_key: str, data: Dict[str, Any], sub_flags: Dict[str, int]) -> Dict[str, Any]:
         """BackSide 및 FrontSide를 각각 그룹화하여 병합 (Convex Hull 적용)"""
+        # 병합 대상(2개 이상)이 없고 키 순서도 결과 순서(기타 -> BackSide -> FrontSide)와 같으면
+        # 결과가 입력과 동일하므로 dict를 새로 만들지 않고 그대로 반환
+        back_count = front_count = 0
+        in_order = True
+        last_rank = 0
+        for flags in sub_flags.values():
+            rank = 0
+            if not flags & self.PART_FLANGE:
+                if flags & self.PART_BACKSIDE:
+                    rank = 1
+                    back_count += 1
+                elif flags & self.PART_FRONTSIDE:
+                    rank = 2
+                    front_count += 1
+            if rank < last_rank: in_order = False
+            else: last_rank = rank
+        if back_count < 2 and front_count < 2 and in_order:
+            return data
+
         back_candidates = {}
         front_candidates = {}
-        other_parts = {}
+        # 병합 대상이 아닌 부재는 결과 dict에 바로 담아 별도 복사를 없앰
+        final_data = {}
         
         for k, v in data.items():
-            is_back = ("_BackSide_" in k and "_Flange" not in k)
-            is_front = ("_FrontSide_" in k and "_Flange" not in k)
+            flags = sub_flags[k]
+            is_flange = flags & self.PART_FLANGE
+            is_back = (flags & self.PART_BACKSIDE and not is_flange)
+            is_front = (flags & self.PART_FRONTSIDE and not is_flange)
             
             if is_back:
                 back_candidates[k] = v
             elif is_front:
                 front_candidates[k] = v
             else:
-                other_parts[k] = v 
+                final_data[k] = v 
         
-        final_data = other_parts.copy()
-        idx_match = re.search(r"(\d+)$", longi_key)
+        idx_match = self.trailing_num_pattern.search(longi_key)
         idx_str = idx_match.group(1) if idx_match else "000"
 
         # 1. BackSide 병합
         if len(back_candidates) >= 2:
             merged_back = self.merger.merge_by_convex_hull(back_candidates)
-            sorted_keys = sorted(merged_back.keys())
-            for i, m_key in enumerate(sorted_keys):
-                new_sub_key = f"Longi_{idx_str}_BackSide_{i+1:03d}"
-                final_data[new_sub_key] = merged_back[m_key]
+            final_data.update(self._renumber_merged(merged_back, idx_str, "BackSide"))
         else:
             final_data.update(back_candidates)
 
         # 2. FrontSide 병합
         if len(front_candidates) >= 2:
             merged_front = self.merger.merge_by_convex_hull(front_candidates)
-            sorted_keys = sorted(merged_front.keys())
-            for i, m_key in enumerate(sorted_keys):
-                # FrontSide 결과도 병합 로직은 동일하지만, 키 이름은 FrontSide로 지정
-                new_sub_key = f"Longi_{idx_str}_FrontSide_{i+1:03d}"
-                final_data[new_sub_key] = merged_front[m_key]
+            # FrontSide 결과도 병합 로직은 동일하지만, 키 이름은 FrontSide로 지정
+            final_data.update(self._renumber_merged(merged_front, idx_str, "FrontSide"))
         else:
             final_data.update(front_candidates)
 
         return final_data
 
+    @staticmethod
+    def _renumber_merged(merged: Dict[str, Any], idx_str: str, part_type: str) -> Dict[str, Any]:
+        """병합 결과를 키 정렬 순서대로 Longi_{idx}_{part_type}_NNN 으로 번호 매김"""
+        # 병합 성공 시 결과는 키 1개('Merged_BackSide')뿐이므로 정렬 생략
+        keys = sorted(merged) if len(merged) > 1 else merged
+        return {f"Longi_{idx_str}_{part_type}_{i:03d}": merged[k] for i, k in enumerate(keys, 1)}
+
     def _process_plane_item(self, old_key: str, value: Any, output_dict: Dict[str, Any]):
-        match = re.search(r"Standard_Surface_(\d+)", old_key, re.IGNORECASE)
-        if match:
-            new_key = f"Plane_Standard_{int(match.group(1)):03d}"
-            output_dict[new_key] = value
+        match = self.surface_pattern.search(old_key)
+        if not match:
+            output_dict[old_key] = value
             return
 
-        match = re.search(r"Stiffener_Surface_(\d+)", old_key, re.IGNORECASE)
-        if match:
-            new_key = f"Plane_Stiffener_{int(match.group(1)):03d}"
-            output_dict[new_key] = value
-            return
+        # 우선순위 유지: Standard (어디든) > 첫 Stiffener > 첫 Surface
+        # 대부분의 키는 Surface 번호가 하나뿐이므로 뒤쪽 검색 1회로 끝남
+        best = match
+        while best.group('standard') is None:
+            match = self.surface_pattern.search(old_key, match.end())
+            if match is None: break
+            if match.group('standard') is not None or (match.group('stiffener') is not None and best.group('stiffener') is None):
+                best = match
 
-        match = re.search(r"Surface_(\d+)", old_key, re.IGNORECASE)
-        if match:
-            new_key = f"Plane_{int(match.group(1)):03d}"
-            output_dict[new_key] = value
-            return
+        num = int(best.group('num'))
+        if best.group('standard') is not None:
+            new_key = f"Plane_Standard_{num:03d}"
+        elif best.group('stiffener') is not None:
+            new_key = f"Plane_Stiffener_{num:03d}"
+        else:
+            new_key = f"Plane_{num:03d}"
+        output_dict[new_key] = value
 
-        output_dict[old_key] = value
-
-    def _transform_recursive(self, data: Any) -> Any:
-        if isinstance(data, dict):
-            new_data = {}
-            for k, v in data.items():
-                if "vertex" in k.lower() and isinstance(v, dict):
-                    try:
-                        x = float(v.get('x', 0))
-                        y = float(v.get('y', 0))
-                        z = float(v.get('z', 0))
-                        new_data[k] = {'x': -y, 'y': z, 'z': x}
-                    except (ValueError, TypeError):
-                        new_data[k] = v
-                else:
-                    new_data[k] = self._transform_recursive(v)
-            return new_data
-        elif isinstance(data, list):
-            return [self._transform_recursive(item) for item in data]
-        return data
\ No newline at end of file
+    def _transform_vertices(self, root: Any, visited: Optional[Set[int]] = None) -> bool:
+        """
+        root 아래의 Vertex 좌표를 (x, y, z) -> (-y, z, x)로 제자리 변환합니다.
+        재귀 대신 명시적 스택으로 순회하며, Vertex dict 슬롯만 새 dict로 교체합니다.
+        visited: 이미 순회한 dict/list의 id 집합. 공유 참조된 하위 트리는 다시 순회하지 않음
+                 (제자리 변환이므로 재순회 시 좌표가 두 번 회전되는 것도 방지)
+        반환값: root가 하위 부재 컨테이너인지 여부 (최상위에 'Vertex' 키가 없는 dict)
+        """
+        if not isinstance(root, (dict, list)):
+            return False
+        if visited is None: visited = set()
+        if id(root) in visited:
+            # 이미 변환된 하위 트리: 컨테이너 여부만 판별
+            return isinstance(root, dict) and not any("Vertex" in k for k in root)
+        root_has_vertex = False
+        # 스택에는 dict/list만 쌓임
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            node_id = id(node)
+            if node_id in visited: continue
+            visited.add(node_id)
+            if isinstance(node, dict):
+                for k, v in node.items():
+                    if "Vertex" in k:
+                        # 컨테이너 판별(최상위 키)도 같은 순회에서 처리
+                        if node is root: root_has_vertex = True
+                        is_vertex = isinstance(v, dict)
+                    else:
+                        # 'x'/'X'가 없는 키는 어떤 대소문자 조합으로도 "vertex"를 포함할 수 없으므로 lower() 생략
+                        is_vertex = isinstance(v, dict) and ("x" in k or "X" in k) and "vertex" in k.lower()
+                    if is_vertex:
+                        try:
+                            x = float(v.get('x', 0))
+                            y = float(v.get('y', 0))
+                            z = float(v.get('z', 0))
+                        except (ValueError, TypeError):
+                            continue
+                        # 기존 키에 대한 값 교체이므로 순회 중에도 dict 크기/순서는 유지됨
+                        node[k] = {'x': -y, 'y': z, 'z': x}
+                    elif isinstance(v, (dict, list)):
+                        stack.append(v)
+            elif isinstance(node, list):
+                stack.extend(item for item in node if isinstance(item, (dict, list)))
+        return isinstance(root, dict) and not root_has_vertex
@@ -1,8 +1,12 @@
 # src/processors/converters/geometry_merger.py
 import math
+import itertools
 import numpy as np
-from scipy.spatial import ConvexHull
-from typing import List, Dict, Tuple, Any, Set
+from scipy.spatial import ConvexHull, cKDTree
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import connected_components
+from typing import List, Dict, Tuple, Any, Set, Optional
+from collections import defaultdict
 from src.utils import Log
 
 class GeometryMerger:
@@ -12,10 +16,34 @@ class GeometryMerger:
     - [New] Convex Hull Merge (흩어진 조각을 하나의 볼록 다각형으로 통합)
     """
 
+    # 이 개수 미만의 면 그룹은 KD-Tree 대신 거리 행렬(GEMM 1회)로 후보 쌍을 구합니다.
+    KDTREE_MIN_FACES = 64
+    # 면 접촉 일괄 검사 시 한 번에 전개하는 Edge 쌍 개수 상한
+    EDGE_PAIR_CHUNK = 1 << 20
+    # 이 개수 이하의 면은 동일 평면 판정을 (N,N) 행렬 1회로 수행 (버킷 탐색보다 호출 수가 적음)
+    PLANE_DENSE_MAX_FACES = 256
+    # T-Junction 검사 시 한 번에 전개하는 (Edge x 후보 점) 원소 개수 상한
+    T_JUNCTION_CHUNK = 1 << 20
+    # (Edge x 후보 점) 개수가 이보다 크면 KD-Tree로 Edge 근처의 점만 추려 판정 (작은 클러스터는 전체 브로드캐스트가 더 빠름)
+    T_JUNCTION_KDTREE_MIN_PAIRS = 1 << 13
+    # 이 Vertex 개수 이상의 다각형은 Artifact 정리를 NumPy 마스크로 수행 (작은 다각형은 Python 루프가 더 빠름)
+    CLEAN_NUMPY_MIN_VERTS = 96
+    # Convex Hull 결과 캐시 상한 (입력 점 개수 / 항목 수)
+    HULL_CACHE_MAX_POINTS = 4096
+    HULL_CACHE_MAX_ENTRIES = 1024
+    # 이 점 개수 이상이면 Akl-Toussaint 8각형 내부 점을 제거한 뒤 Qhull 호출 (작은 입력은 사전 필터 비용이 더 큼)
+    HULL_PREFILTER_MIN_POINTS = 1024
+
     def __init__(self, norm_tol: float = 0.01, dist_tol: float = 0.01, point_tol: float = 0.001):
         self.norm_tol = norm_tol
         self.dist_tol = dist_tol
         self.point_tol = point_tol
+        # 입력 좌표 바이트열 -> Hull 3D 좌표 배열 (반복 배치된 동일 형상의 재계산 방지)
+        self._hull_cache = {}
+
+    def clear_cache(self) -> None:
+        """파일 단위 처리 시작 시 Convex Hull 캐시를 비웁니다."""
+        self._hull_cache.clear()
 
     def merge_by_convex_hull(self, plane_items: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -23,28 +51,36 @@ class GeometryMerger:
         이를 감싸는 하나의 볼록 다각형(Convex Hull)으로 병합합니다.
         Longi BackSide 최적화용으로 사용됩니다.
         """
-        # 1. 모든 Vertex 수집
-        all_verts = []
-        for key, val in plane_items.items():
-            verts = self._extract_vertices(val)
-            for v in verts:
-                all_verts.append([v['x'], v['y'], v['z']])
+        # 1. 모든 Vertex 수집 (Vertex dict를 만들지 않고 좌표를 바로 (N,3) 배열로)
+        coords = []
+        for val in plane_items.values():
+            self._collect_coords(val, coords)
         
-        if len(all_verts) < 3:
+        if len(coords) < 9:
             return plane_items # 점이 너무 적으면 병합 불가
 
-        points = np.array(all_verts)
+        points = np.array(coords, dtype=np.float64).reshape(-1, 3)
+
+        # 동일한 좌표 집합(순서 포함)은 같은 Hull을 만들므로 캐시된 결과를 재사용
+        cache_key = None
+        if len(points) <= self.HULL_CACHE_MAX_POINTS:
+            cache_key = (points.dtype.str, points.tobytes())
+            cached = self._hull_cache.get(cache_key)
+            if cached is not None:
+                return {"Merged_BackSide": self._hull_to_json(cached)}
         
         # 2. 최적 평면 도출 (PCA/SVD 이용)
         centroid = np.mean(points, axis=0)
         centered = points - centroid
         
         try:
-            u, s, vh = np.linalg.svd(centered)
+            # Normal(vh)만 필요하므로 (N,N) U 행렬은 만들지 않음 (점 개수에 대해 제곱 비용 제거)
+            _, _, vh = np.linalg.svd(centered, full_matrices=False)
             normal = vh[2, :] 
         except np.linalg.LinAlgError:
             Log.warning("SVD failed during Convex Hull merge. Using default normal.")
             normal = np.array([0, 0, 1])
+            cache_key = None  # 경고 로그가 매번 남도록 캐시하지 않음
 
         # 3. 로컬 2D 좌표계 생성
         if abs(normal[0]) < 0.9:
@@ -68,8 +104,12 @@ class GeometryMerger:
         
         # 5. 2D Convex Hull 계산
         try:
-            hull = ConvexHull(points_2d)
-            hull_indices = hull.vertices
+            # Hull이 될 수 없는 내부 점은 미리 제외하고, 남은 점의 번호를 원래 인덱스로 되돌림
+            candidates = self._hull_candidates(points_2d) if len(points_2d) >= self.HULL_PREFILTER_MIN_POINTS else None
+            if candidates is None:
+                hull_indices = ConvexHull(points_2d).vertices
+            else:
+                hull_indices = candidates[ConvexHull(points_2d[candidates]).vertices]
         except Exception as e:
             Log.warning(f"ConvexHull calculation failed: {e}. Reverting to original.")
             return plane_items
@@ -77,124 +117,160 @@ class GeometryMerger:
         # 6. 2D Hull 점들을 다시 3D로 복원
         hull_points_2d = points_2d[hull_indices]
         
-        hull_points_3d = []
-        for p2 in hull_points_2d:
-            # P_3d = Centroid + x*X_axis + y*Y_axis
-            p3 = centroid + p2[0] * x_axis + p2[1] * y_axis
-            hull_points_3d.append({'x': p3[0], 'y': p3[1], 'z': p3[2]})
+        # P_3d = Centroid + x*X_axis + y*Y_axis (모든 Hull 점을 브로드캐스트 1회로 복원, 연산 순서는 점별 계산과 동일)
+        hull_points_3d = centroid + hull_points_2d[:, 0, None] * x_axis + hull_points_2d[:, 1, None] * y_axis
+        if cache_key is not None:
+            if len(self._hull_cache) >= self.HULL_CACHE_MAX_ENTRIES:
+                self._hull_cache.clear()
+            self._hull_cache[cache_key] = hull_points_3d
             
-        # 7. 결과 반환
-        result = {}
-        result["Merged_BackSide"] = self._format_to_json(hull_points_3d)
-        
-        return result
+        # 7. 결과 반환 (캐시 적중 시에도 출력 dict는 매번 새로 생성하여 결과 간 공유 방지)
+        return {"Merged_BackSide": self._hull_to_json(hull_points_3d)}
 
-    def merge_planes(self, plane_items: Dict[str, Any]) -> Dict[str, Any]:
-        """기존의 인접 평면 병합 로직"""
-        current_data = plane_items
+    @staticmethod
+    def _hull_candidates(points_2d: np.ndarray) -> Optional[np.ndarray]:
+        """
+        x, y, x+y, x-y 방향 극점으로 만든 8각형(반시계)의 엄격한 내부 점을 제외한 인덱스를 반환합니다.
+        8각형이 퇴화(꼭짓점 3개 미만)하면 None
+        """
+        x, y = points_2d[:, 0], points_2d[:, 1]
+        s, d = x + y, x - y
+        extremes = [x.argmin(), s.argmin(), y.argmin(), d.argmax(), x.argmax(), s.argmax(), y.argmax(), d.argmin()]
+        octagon = []
+        for i in extremes:
+            if not octagon or octagon[-1] != i:
+                octagon.append(i)
+        if len(octagon) > 1 and octagon[0] == octagon[-1]:
+            octagon.pop()
+        if len(octagon) < 3:
+            return None
+
+        # 모든 변의 왼쪽(외적 > 0)에 있는 점만 내부. 변 위의 점은 남김
+        Q = points_2d[octagon]
+        E = np.roll(Q, -1, axis=0) - Q
+        cross = E[:, 0, None] * (y - Q[:, 1, None]) - E[:, 1, None] * (x - Q[:, 0, None])
+        return np.flatnonzero(~(cross > 0).all(axis=0))
+
+    def _hull_to_json(self, hull_points_3d: np.ndarray) -> Dict[str, Any]:
+        return {f"Vertex_{i:03d}": {'x': x, 'y': y, 'z': z} for i, (x, y, z) in enumerate(hull_points_3d, 1)}
+
+    def merge_planes(self, plane_items: Dict[str, Any], out: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        기존의 인접 평면 병합 로직.
+        입력 plane_items는 변경하지 않습니다.
+        out: 결과를 추가할 dict. 주어지면 새 dict를 만들지 않고 out에 직접 기록하여 반환
+        """
+        result = {} if out is None else out
         original_point_tol = self.point_tol
+        # JSON 파싱은 최초 1회만 수행하고, 이후 Pass는 직전 Pass의 Vertex 리스트를 그대로 사용
+        face_verts = [(key, self._extract_vertices(val)) for key, val in plane_items.items()]
         
         for i in range(2):
             pass_num = i + 1
-            input_count = len(current_data)
+            input_count = len(face_verts)
             
             Log.info(f"--- Merge Pass {pass_num} Started (Input: {input_count} faces) ---")
             
+            # Pass 2는 완화된 point_tol로 수행하고, 예외가 나더라도 원래 값으로 복원
             if pass_num == 2:
-                relaxed_tol = 0.05
-                self.point_tol = relaxed_tol
-
-            new_data = self._execute_single_pass(current_data, pass_num)
+                self.point_tol = 0.05
+            try:
+                face_list = self._build_face_records(face_verts)
+                # 중간 Pass의 JSON 결과는 쓰이지 않으므로 마지막 Pass만 결과 dict에 기록
+                face_verts = self._execute_single_pass(face_list, pass_num, result if pass_num == 2 else None)
+            finally:
+                self.point_tol = original_point_tol
             
-            output_count = len(new_data)
+            output_count = len(face_verts)
             Log.info(f"--- Merge Pass {pass_num} Completed (Output: {output_count} faces) ---")
 
-            if pass_num == 2:
-                 self.point_tol = original_point_tol
-
-            if input_count == output_count and pass_num == 2:
-                return new_data
-
-            current_data = new_data
+        return result
 
-        return current_data
+    def _build_face_records(self, face_verts: List[Tuple[str, List[Dict]]]) -> List[Dict[str, Any]]:
+        """(key, verts) 목록으로부터 Normal, d, Edge 등 면 단위 특징을 계산합니다."""
+        valid = [(key, verts) for key, verts in face_verts if len(verts) >= 3]
+        if not valid: return []
+        # 모든 면의 좌표/Edge를 연속 배열 하나로 한 번에 계산하고, 면별 배열은 해당 구간의 뷰로 공유 (면마다 NumPy 호출 제거)
+        counts = np.array([len(verts) for _, verts in valid])
+        ends = np.cumsum(counts)
+        starts = ends - counts
+        all_V = self._verts_to_array([v for _, verts in valid for v in verts])
+        # 좌표 배열은 읽기 전용으로 고정하여, 복사 없이 Edge/후보 계산에서 뷰로 공유
+        all_V.setflags(write=False)
+        # 각 Vertex의 다음 Vertex 번호 (면의 마지막 Vertex는 같은 면의 첫 Vertex로 순환)
+        next_idx = np.arange(1, len(all_V) + 1)
+        next_idx[ends - 1] = starts
+        all_edges = self._extract_edges(all_V, next_idx)
+
+        bounds = list(zip(starts.tolist(), ends.tolist()))
+        V_list = [all_V[lo:hi] for lo, hi in bounds]
+        # 모든 면의 Normal을 Vertex 개수별 배치로 한 번에 계산
+        normals = self._calculate_normals_batch(V_list)
 
-    def _execute_single_pass(self, plane_items: Dict[str, Any], pass_num: int) -> Dict[str, Any]:
-        # (기존 로직 유지)
-        all_input_keys = set(plane_items.keys())
-        successfully_processed_keys = set()
-        
         face_list = []
-        for key, val in plane_items.items():
-            verts = self._extract_vertices(val)
-            if len(verts) < 3:
-                continue
-            
-            normal = self._calculate_normal(verts)
+        for (key, verts), V, (lo, hi), normal in zip(valid, V_list, bounds, normals):
             d = -(normal[0]*verts[0]['x'] + normal[1]*verts[0]['y'] + normal[2]*verts[0]['z'])
-            
+            # 좌표 연산용 (n,3) 배열 (SoA). verts(dict)는 JSON 출력용으로만 유지
             face_list.append({
                 'original_key': key,
                 'verts': verts,
+                'V': V,
+                # 위상 비교(T-Junction/경계 Edge)용 양자화 좌표. Pass마다 면당 한 번만 계산
+                'pts': [self._pt_to_tuple(v) for v in verts],
                 'normal': normal,
                 'd': d,
-                'edges': self._extract_edges(verts)
+                'edges': {name: arr[lo:hi] for name, arr in all_edges.items()}
             })
+        return face_list
 
+    def _execute_single_pass(self, face_list: List[Dict[str, Any]], pass_num: int, out: Optional[Dict[str, Any]] = None) -> List[Tuple[str, List[Dict]]]:
+        """
+        한 번의 병합 Pass를 수행합니다.
+        out이 주어지면 JSON 결과를 out에 기록합니다.
+        반환값: 다음 Pass 입력용 (key, verts) 목록
+        """
         plane_groups = self._group_by_plane(face_list)
         
-        merged_results = {}
+        emitted_verts = []
         idx_counter = 1
 
         for group in plane_groups:
             clusters = self._cluster_by_adjacency(group)
             
             for cluster in clusters:
-                cluster_source_keys = [f['original_key'] for f in cluster]
                 merged_polygons = self._merge_cluster_to_polygons(cluster)
+                # 병합되지 않은 클러스터는 원본 면을 그대로 출력
+                out_polygons = merged_polygons if merged_polygons else [face['verts'] for face in cluster]
                 
-                if not merged_polygons:
-                    for face in cluster:
-                        new_key = f"Plane_{idx_counter:03d}"
-                        merged_results[new_key] = self._format_to_json(face['verts'])
-                        successfully_processed_keys.add(face['original_key'])
-                        idx_counter += 1
-                else:
-                    for poly_verts in merged_polygons:
-                        new_key = f"Plane_{idx_counter:03d}"
-                        merged_results[new_key] = self._format_to_json(poly_verts)
-                        idx_counter += 1
-                    
-                    for k in cluster_source_keys:
-                        successfully_processed_keys.add(k)
+                for poly_verts in out_polygons:
+                    new_key = f"Plane_{idx_counter:03d}"
+                    if out is not None:
+                        out[new_key] = self._format_to_json(poly_verts)
+                    emitted_verts.append((new_key, poly_verts))
+                    idx_counter += 1
 
-        return merged_results
+        return emitted_verts
 
     # ... Helper Methods ...
     def _merge_cluster_to_polygons(self, cluster: List[Dict]) -> List[List[Dict]]:
         # (기존 로직 유지)
         refined_cluster = self._resolve_t_junctions(cluster)
+        # 양자화된 점마다 정수 id를 부여하고, Edge는 (작은 id, 큰 id)를 묶은 정수 하나로 집계
+        # Edge 목록은 한 번만 만들어 두고 경계 Edge(공유되지 않은 Edge)만 같은 순서로 추림
+        point_ids = {}
+        edges = []
         edge_count = {}
         for face in refined_cluster:
-            verts = face['verts']
-            n = len(verts)
+            pts = face['pts']
+            ids = [point_ids.setdefault(p, len(point_ids)) for p in pts]
+            n = len(pts)
             for i in range(n):
-                p1 = self._pt_to_tuple(verts[i])
-                p2 = self._pt_to_tuple(verts[(i+1)%n])
-                edge_key = tuple(sorted((p1, p2)))
-                if edge_key not in edge_count: edge_count[edge_key] = 0
-                edge_count[edge_key] += 1
+                a, b = ids[i], ids[(i+1)%n]
+                edge_key = (a << 32) | b if a < b else (b << 32) | a
+                edge_count[edge_key] = edge_count.get(edge_key, 0) + 1
+                edges.append((pts[i], pts[(i+1)%n], edge_key))
 
-        boundary_edges = []
-        for face in refined_cluster:
-            verts = face['verts']
-            n = len(verts)
-            for i in range(n):
-                p1 = self._pt_to_tuple(verts[i])
-                p2 = self._pt_to_tuple(verts[(i+1)%n])
-                edge_key = tuple(sorted((p1, p2)))
-                if edge_count[edge_key] == 1:
-                    boundary_edges.append((p1, p2))
+        boundary_edges = [(p1, p2) for p1, p2, edge_key in edges if edge_count[edge_key] == 1]
 
         if not boundary_edges: return None
 
@@ -223,12 +299,57 @@ class GeometryMerger:
         for _ in range(max_iterations):
             start_len = len(current_verts)
             if start_len < 3: break
-            current_verts = self._remove_spikes(current_verts, self.point_tol)
-            current_verts = self._remove_short_edges(current_verts, self.point_tol)
-            current_verts = self._remove_collinear(current_verts)
+            if start_len >= self.CLEAN_NUMPY_MIN_VERTS:
+                current_verts = self._clean_pass_array(current_verts, self.point_tol)
+            else:
+                current_verts = self._remove_spikes(current_verts, self.point_tol)
+                current_verts = self._remove_short_edges(current_verts, self.point_tol)
+                current_verts = self._remove_collinear(current_verts)
             if len(current_verts) == start_len: break
         return current_verts
 
+    def _clean_pass_array(self, verts: List[Dict], tol: float) -> List[Dict]:
+        """
+        큰 다각형용: _remove_spikes -> _remove_short_edges -> _remove_collinear 1회분을 (n,3) 배열 마스크로 수행합니다.
+        각 단계는 직전 단계의 결과에 적용되며, 판정식과 연산 순서는 Python 구현과 동일합니다.
+        """
+        V = self._verts_to_array(verts)
+        tol_sq = tol ** 2
+
+        # 1. Spike: 이전 점과 다음 점이 거의 같은 점 삭제
+        if len(V) >= 3:
+            d = np.roll(V, 1, axis=0) - np.roll(V, -1, axis=0)
+            keep = ~((d[:, 0]**2 + d[:, 1]**2 + d[:, 2]**2) < tol_sq)
+            verts = [v for v, k in zip(verts, keep.tolist()) if k]
+            V = V[keep]
+
+        # 2. Short Edge: 다음 점과 거의 같으면 다음 점을 건너뜀 (건너뛴 점은 판정하지 않으므로 순차 처리)
+        n = len(V)
+        if n >= 3:
+            d = V - np.roll(V, -1, axis=0)
+            short = ((d[:, 0]**2 + d[:, 1]**2 + d[:, 2]**2) < tol_sq).tolist()
+            keep = [True] * n
+            skip_next = False
+            for i in range(n):
+                if skip_next:
+                    keep[i] = skip_next = False
+                elif short[i] and i < n - 1:
+                    skip_next = True
+            verts = [v for v, k in zip(verts, keep) if k]
+            V = V[keep]
+
+        # 3. Collinear: 진행 방향이 거의 바뀌지 않는 점 삭제
+        if len(V) >= 3:
+            v1 = V - np.roll(V, 1, axis=0)
+            v2 = np.roll(V, -1, axis=0) - V
+            len1_sq = v1[:, 0]**2 + v1[:, 1]**2 + v1[:, 2]**2
+            len2_sq = v2[:, 0]**2 + v2[:, 1]**2 + v2[:, 2]**2
+            dot = v1[:, 0]*v2[:, 0] + v1[:, 1]*v2[:, 1] + v1[:, 2]*v2[:, 2]
+            threshold_sq = 0.9999 ** 2
+            delete = (len1_sq < 1e-18) | (len2_sq < 1e-18) | ((dot > 0) & (dot * dot > threshold_sq * len1_sq * len2_sq))
+            verts = [v for v, k in zip(verts, (~delete).tolist()) if k]
+        return verts
+
     def _remove_spikes(self, verts, tol):
         if len(verts) < 3: return verts
         n = len(verts)
@@ -266,72 +387,123 @@ class GeometryMerger:
         n = len(verts)
         to_delete = [False] * n
         collinear_threshold = 0.9999 
+        threshold_sq = collinear_threshold ** 2
         for i in range(n):
             p_prev = verts[(i - 1 + n) % n]
             p_curr = verts[i]
             p_next = verts[(i + 1) % n]
             v1 = (p_curr['x'] - p_prev['x'], p_curr['y'] - p_prev['y'], p_curr['z'] - p_prev['z'])
-            len1 = math.sqrt(v1[0]**2 + v1[1]**2 + v1[2]**2)
+            len1_sq = v1[0]**2 + v1[1]**2 + v1[2]**2
             v2 = (p_next['x'] - p_curr['x'], p_next['y'] - p_curr['y'], p_next['z'] - p_curr['z'])
-            len2 = math.sqrt(v2[0]**2 + v2[1]**2 + v2[2]**2)
-            if len1 < 1e-9 or len2 < 1e-9:
+            len2_sq = v2[0]**2 + v2[1]**2 + v2[2]**2
+            if len1_sq < 1e-18 or len2_sq < 1e-18:
                 to_delete[i] = True
                 continue
-            u1 = (v1[0]/len1, v1[1]/len1, v1[2]/len1)
-            u2 = (v2[0]/len2, v2[1]/len2, v2[2]/len2)
-            dot = u1[0]*u2[0] + u1[1]*u2[1] + u1[2]*u2[2]
-            if dot > collinear_threshold: to_delete[i] = True
+            # cos = dot / (|v1||v2|) > threshold  <=>  dot > 0 and dot² > threshold² * |v1|² * |v2|²
+            dot = v1[0]*v2[0] + v1[1]*v2[1] + v1[2]*v2[2]
+            if dot > 0 and dot * dot > threshold_sq * len1_sq * len2_sq: to_delete[i] = True
         return [verts[i] for i in range(n) if not to_delete[i]]
 
     def _resolve_t_junctions(self, cluster):
         all_points = set()
         for face in cluster:
-            for v in face['verts']:
-                all_points.add(self._pt_to_tuple(v))
+            all_points.update(face['pts'])
+        # 후보 점들을 (M,3) 배열로 한 번만 변환
+        candidate_tuples = list(all_points)
+        candidates = np.array(candidate_tuples, dtype=np.float64).reshape(-1, 3)
+        # 클러스터의 모든 Edge를 (E,3) 배열로 연결하고, 선분 위 판정을 Edge 묶음 단위로 한 번에 계산
+        P1 = np.concatenate([face['V'] for face in cluster])
+        vec = np.concatenate([face['edges']['p2'] for face in cluster]) - P1
+        seg_len_sq = vec[:, 0]**2 + vec[:, 1]**2 + vec[:, 2]**2
+        if len(P1) * len(candidates) > self.T_JUNCTION_KDTREE_MIN_PAIRS:
+            hits = self._t_junction_hits_near(candidates, P1, vec, seg_len_sq)
+        else:
+            hits = {}
+            step = max(1, self.T_JUNCTION_CHUNK // max(1, len(candidates)))
+            for lo in range(0, len(P1), step):
+                hi = lo + step
+                on_segment = self._points_on_segments(candidates[None], P1[lo:hi, None], vec[lo:hi, None], seg_len_sq[lo:hi, None])
+                # 길이가 0에 가까운 Edge는 검사하지 않음
+                on_segment[seg_len_sq[lo:hi] < 1e-9] = False
+                for e, j in zip(*np.nonzero(on_segment)):
+                    hits.setdefault(lo + int(e), []).append(int(j))
+
         refined_faces = []
+        edge_base = 0
         for face in cluster:
             original_verts = face['verts']
-            new_verts_sequence = []
+            original_pts = face['pts']
             n = len(original_verts)
+            new_verts_sequence = []
+            # 삽입되는 점은 이미 양자화된 좌표이므로 양자화 결과가 자기 자신과 같음
+            new_pts_sequence = []
             for i in range(n):
                 p1 = original_verts[i]
-                p2 = original_verts[(i+1)%n]
                 new_verts_sequence.append(p1)
-                points_on_segment = []
-                p1_tuple = self._pt_to_tuple(p1)
-                p2_tuple = self._pt_to_tuple(p2)
-                vec = (p2['x']-p1['x'], p2['y']-p1['y'], p2['z']-p1['z'])
-                seg_len_sq = vec[0]**2 + vec[1]**2 + vec[2]**2
-                if seg_len_sq < 1e-9: continue
-                for candidate_pt in all_points:
-                    if candidate_pt == p1_tuple or candidate_pt == p2_tuple: continue
-                    cp = {'x': candidate_pt[0], 'y': candidate_pt[1], 'z': candidate_pt[2]}
-                    if self._is_point_on_segment(cp, p1, p2, vec, seg_len_sq):
-                        points_on_segment.append(candidate_pt)
+                new_pts_sequence.append(original_pts[i])
+                hit = hits.get(edge_base + i)
+                if hit is None: continue
+                # 선분 양 끝점 자체는 제외
+                p1_tuple = original_pts[i]
+                p2_tuple = original_pts[(i+1)%n]
+                points_on_segment = [candidate_tuples[j] for j in hit
+                                     if candidate_tuples[j] != p1_tuple and candidate_tuples[j] != p2_tuple]
                 if points_on_segment:
                     points_on_segment.sort(key=lambda pt: (pt[0]-p1['x'])**2 + (pt[1]-p1['y'])**2 + (pt[2]-p1['z'])**2)
                     for pt in points_on_segment:
                         new_verts_sequence.append({'x': pt[0], 'y': pt[1], 'z': pt[2]})
-            refined_faces.append({'verts': new_verts_sequence})
+                        new_pts_sequence.append(pt)
+            refined_faces.append({'verts': new_verts_sequence, 'pts': new_pts_sequence})
+            edge_base += n
         return refined_faces
 
-    def _is_point_on_segment(self, pt, p1, p2, vec, len_sq):
-        v_pt = (pt['x']-p1['x'], pt['y']-p1['y'], pt['z']-p1['z'])
-        cx = v_pt[1]*vec[2] - v_pt[2]*vec[1]
-        cy = v_pt[2]*vec[0] - v_pt[0]*vec[2]
-        cz = v_pt[0]*vec[1] - v_pt[1]*vec[0]
+    def _t_junction_hits_near(self, candidates, P1, vec, seg_len_sq):
+        """
+        큰 클러스터용: Edge 중점에서 (Edge 길이/2 + 여유) 반경 안의 후보 점만 KD-Tree로 추린 뒤,
+        그 (Edge, 점) 쌍에 대해서만 선분 위 판정을 수행합니다. 반환 형식은 Edge 번호 -> 점 번호 목록(오름차순)
+        선분 위로 판정되는 점은 선분에서 point_tol 이내이므로 이 반경 밖에 있을 수 없습니다.
+        """
+        tree = cKDTree(candidates)
+        radius = 0.5 * np.sqrt(seg_len_sq) + 2.0 * self.point_tol + 1e-6
+        near = tree.query_ball_point(P1 + 0.5 * vec, radius, return_sorted=True)
+        counts = np.fromiter(map(len, near), dtype=np.intp, count=len(near))
+        # 길이가 0에 가까운 Edge는 검사하지 않음
+        counts[seg_len_sq < 1e-9] = 0
+        e_idx = np.repeat(np.arange(len(near)), counts)
+        j_idx = np.fromiter(itertools.chain.from_iterable(near[e] for e in np.flatnonzero(counts).tolist()),
+                            dtype=np.intp, count=len(e_idx))
+        on_segment = self._points_on_segments(candidates[j_idx], P1[e_idx], vec[e_idx], seg_len_sq[e_idx])
+        hits = {}
+        for e, j in zip(e_idx[on_segment].tolist(), j_idx[on_segment].tolist()):
+            hits.setdefault(e, []).append(j)
+        return hits
+
+    def _points_on_segments(self, points, P1, vec, len_sq):
+        """
+        점 배열과 선분(P1, P1 + vec) 배열을 브로드캐스트하여 선분 위 여부를 판정합니다.
+        (E,M) 일괄 판정은 points[None], P1[:, None], vec[:, None], len_sq[:, None] 형태로 전달합니다.
+        """
+        vx = points[..., 0] - P1[..., 0]
+        vy = points[..., 1] - P1[..., 1]
+        vz = points[..., 2] - P1[..., 2]
+        ex, ey, ez = vec[..., 0], vec[..., 1], vec[..., 2]
+        cx = vy*ez - vz*ey
+        cy = vz*ex - vx*ez
+        cz = vx*ey - vy*ex
         dist_sq = cx**2 + cy**2 + cz**2
-        if dist_sq > (self.point_tol**2) * len_sq: return False
-        dot = v_pt[0]*vec[0] + v_pt[1]*vec[1] + v_pt[2]*vec[2]
-        if dot < self.point_tol or dot > len_sq - self.point_tol: return False
-        return True
+        dot = vx*ex + vy*ey + vz*ez
+        return (dist_sq <= (self.point_tol**2) * len_sq) & (dot >= self.point_tol) & (dot <= len_sq - self.point_tol)
 
     def _chain_edges_all(self, edges):
         adj = {}
         for start, end in edges: adj[start] = end
         loops = []
+        # 남은 첫 키(삽입 순서)를 찾기 위해 키 순서 목록을 한 번만 만들고 앞에서부터 전진 (매 루프마다 키 목록 복사 제거)
+        order = list(adj)
+        cursor = 0
         while adj:
-            start_pt = list(adj.keys())[0]
+            while order[cursor] not in adj: cursor += 1
+            start_pt = order[cursor]
             curr_pt = start_pt
             loop = []
             safe_count = 0
@@ -351,96 +523,278 @@ class GeometryMerger:
                 safe_count += 1
         return loops
 
-    def _extract_edges(self, verts):
-        edges = []
-        n = len(verts)
-        for i in range(n):
-            p1, p2 = verts[i], verts[(i+1)%n]
-            vec = (p2['x']-p1['x'], p2['y']-p1['y'], p2['z']-p1['z'])
-            length = math.sqrt(vec[0]**2 + vec[1]**2 + vec[2]**2)
-            unit_vec = (0,0,0) if length < 1e-9 else (vec[0]/length, vec[1]/length, vec[2]/length)
-            edges.append({'p1': p1, 'p2': p2, 'vec': unit_vec, 'length': length})
-        return edges
+    def _verts_to_array(self, verts):
+        return np.array([(v['x'], v['y'], v['z']) for v in verts], dtype=np.float64).reshape(-1, 3)
+
+    def _extract_edges(self, V, next_idx):
+        """
+        (N,3) Vertex 배열과 각 Vertex의 다음 Vertex 번호로부터 Edge 정보를 (E,3)/(E,) 배열로 묶어 반환합니다.
+        (p1, p2, 단위 방향, 길이)
+        """
+        p1 = V
+        p2 = V[next_idx]
+        vec = p2 - p1
+        length = np.sqrt(vec[:, 0]**2 + vec[:, 1]**2 + vec[:, 2]**2)
+        unit_vec = np.zeros_like(vec)
+        valid = length >= 1e-9
+        unit_vec[valid] = vec[valid] / length[valid, None]
+        return {'p1': p1, 'p2': p2, 'vec': unit_vec, 'length': length}
 
     def _cluster_by_adjacency(self, group):
         n = len(group)
-        parent = list(range(n))
-        def find(i):
-            if parent[i] == i: return i
-            parent[i] = find(parent[i])
-            return parent[i]
-        def union(i, j):
-            r1, r2 = find(i), find(j)
-            if r1 != r2: parent[r2] = r1
-        for i in range(n):
-            for j in range(i+1, n):
-                if self._are_faces_touching(group[i], group[j]): union(i, j)
+        pairs = self._candidate_face_pairs(group)
+        # 후보 쌍 전체의 접촉 여부를 Edge 쌍 배열 단위로 한 번에 판정한 뒤, 접촉 그래프의 연결 요소를 C 구현으로 계산
+        touching = pairs[self._touching_pairs_mask(group, pairs)]
+        graph = csr_matrix((np.ones(len(touching), dtype=np.int8), (touching[:, 0], touching[:, 1])), shape=(n, n))
+        _, labels = connected_components(graph, directed=False)
+        # 클러스터 순서/구성원 순서는 각 클러스터의 가장 작은 면 번호 순 (기존 union-find 결과와 동일)
         clusters = {}
-        for i in range(n):
-            r = find(i)
-            if r not in clusters: clusters[r] = []
-            clusters[r].append(group[i])
+        for face, label in zip(group, labels.tolist()):
+            if label not in clusters: clusters[label] = []
+            clusters[label].append(face)
         return list(clusters.values())
 
-    def _are_faces_touching(self, face_a, face_b):
-        for ea in face_a['edges']:
-            for eb in face_b['edges']:
-                dot = abs(sum(a*b for a,b in zip(ea['vec'], eb['vec'])))
-                if dot < (1.0 - self.norm_tol): continue
-                if self._is_collinear(ea, eb) and self._is_overlapping(ea, eb): return True
-        return False
-
-    def _is_collinear(self, ea, eb):
-        diff = (eb['p1']['x']-ea['p1']['x'], eb['p1']['y']-ea['p1']['y'], eb['p1']['z']-ea['p1']['z'])
-        cx = diff[1]*ea['vec'][2] - diff[2]*ea['vec'][1]
-        cy = diff[2]*ea['vec'][0] - diff[0]*ea['vec'][2]
-        cz = diff[0]*ea['vec'][1] - diff[1]*ea['vec'][0]
-        return (cx**2 + cy**2 + cz**2) < (self.point_tol**2)
-
-    def _is_overlapping(self, ea, eb):
-        def proj(p, o, v): return (p['x']-o['x'])*v[0] + (p['y']-o['y'])*v[1] + (p['z']-o['z'])*v[2]
-        o, v = ea['p1'], ea['vec']
-        b1, b2 = proj(eb['p1'], o, v), proj(eb['p2'], o, v)
-        start, end = max(0.0, min(b1, b2)), min(ea['length'], max(b1, b2))
-        return (end - start) > self.point_tol
+    def _candidate_face_pairs(self, group):
+        """
+        면 중심점 + 경계 구 반지름으로 접촉 가능성이 있는 면 쌍 (i < j)만 추립니다.
+        (작은 그룹은 거리 행렬, 큰 그룹은 KD-Tree 사용) 이후 AABB 겹침 검사로 한 번 더 거릅니다.
+        접촉 판정은 평행 허용각(sin θ)만큼 Edge가 기울어질 수 있으므로,
+        거리 한계에 point_tol + (면 j의 Edge 길이) * sin θ 여유를 더해 누락이 없도록 합니다.
+        """
+        n = len(group)
+        if n < 2: return np.empty((0, 2), dtype=np.intp)
+        centers = np.array([f['V'].mean(axis=0) for f in group])
+        # sqrt는 단조 증가이므로 최대 제곱 거리에 한 번만 적용
+        radii = np.sqrt([((f['V'] - c)**2).sum(axis=1).max() for f, c in zip(group, centers)])
+        cos_min = 1.0 - self.norm_tol
+        sin_max = 1.0 if cos_min <= 0 else math.sqrt(max(0.0, 1.0 - cos_min**2))
+        slack = self.point_tol * (1.0 + 1e-9) + 1e-9
+
+        if n < self.KDTREE_MIN_FACES:
+            i_idx, j_idx = np.triu_indices(n, k=1)
+            limit = radii[i_idx] + radii[j_idx] * (1.0 + 2.0 * sin_max) + slack
+            # 작은 그룹: 절반 제곱 노름을 이용해 ‖a-b‖² = 2(½‖a‖² + ½‖b‖² - a·b) 를 행렬곱 1회로 계산
+            half_sq = 0.5 * (centers**2).sum(axis=1)
+            half_d2 = half_sq[:, None] + half_sq[None, :] - centers @ centers.T
+            d2 = 2.0 * half_d2[i_idx, j_idx]
+            # 전개식의 반올림 오차(‖a‖²+‖b‖² 규모)를 허용 범위에 포함
+            d2_tol = 1e-12 * (half_sq[i_idx] + half_sq[j_idx])
+            keep = d2 <= limit**2 + d2_tol
+        else:
+            tree = cKDTree(centers)
+            search_r = 2.0 * radii.max() * (1.0 + sin_max) + slack
+            pairs = tree.query_pairs(r=search_r, output_type='ndarray')
+            if len(pairs) == 0: return np.empty((0, 2), dtype=np.intp)
+            pairs = np.sort(pairs, axis=1)
+            pairs = pairs[np.lexsort((pairs[:, 1], pairs[:, 0]))]
+
+            i_idx, j_idx = pairs[:, 0], pairs[:, 1]
+            d2 = ((centers[i_idx] - centers[j_idx])**2).sum(axis=1)
+            limit = radii[i_idx] + radii[j_idx] * (1.0 + 2.0 * sin_max) + slack
+            keep = d2 <= limit**2
+        i_idx, j_idx = i_idx[keep], j_idx[keep]
+
+        # AABB 사전 배제: 면 i의 박스를 (point_tol + 면 j 최대 Edge 길이 * sin θ) 만큼 확장해 겹침 확인
+        bb_min = np.array([f['V'].min(axis=0) for f in group])
+        bb_max = np.array([f['V'].max(axis=0) for f in group])
+        max_edge = np.array([f['edges']['length'].max() for f in group])
+        margin = (slack + max_edge[j_idx] * sin_max)[:, None]
+        overlap = np.all((bb_min[j_idx] <= bb_max[i_idx] + margin) & (bb_min[i_idx] - margin <= bb_max[j_idx]), axis=1)
+        return np.column_stack((i_idx[overlap], j_idx[overlap]))
+
+    def _touching_pairs_mask(self, group, pairs):
+        """
+        후보 면 쌍 (P,2) 각각에 대해, 두 면의 모든 Edge 쌍 (Ea x Eb) 중 평행한 쌍만 골라
+        동일 직선 + 구간 겹침 여부를 검사합니다. 모든 쌍의 Edge 쌍을 평탄화하여 배열 연산으로 일괄 처리합니다.
+        """
+        touching = np.zeros(len(pairs), dtype=bool)
+        if len(pairs) == 0: return touching
+
+        # 그룹 내 모든 Edge를 하나의 배열로 연결 (면 f의 Edge는 offsets[f] 부터 counts[f] 개)
+        counts = np.array([len(f['edges']['length']) for f in group])
+        offsets = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        p1 = np.concatenate([f['edges']['p1'] for f in group])
+        p2 = np.concatenate([f['edges']['p2'] for f in group])
+        vec = np.concatenate([f['edges']['vec'] for f in group])
+        length = np.concatenate([f['edges']['length'] for f in group])
+
+        fa, fb = pairs[:, 0], pairs[:, 1]
+        eb_count = counts[fb]
+        per_pair = counts[fa] * eb_count
+        # 메모리 상한: Edge 쌍 개수 기준으로 후보 쌍을 나누어 처리
+        bounds = np.searchsorted(np.cumsum(per_pair), np.arange(1, 1 + per_pair.sum() // self.EDGE_PAIR_CHUNK) * self.EDGE_PAIR_CHUNK)
+        for lo, hi in zip(np.concatenate(([0], bounds)), np.concatenate((bounds, [len(pairs)]))):
+            if lo >= hi: continue
+            sizes = per_pair[lo:hi]
+            # 각 Edge 쌍이 속한 면 쌍 번호와, 면 쌍 안에서의 (a, b) Edge 인덱스 (a 우선 순회)
+            pid = np.repeat(np.arange(lo, hi), sizes)
+            local = np.arange(sizes.sum()) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+            nb = eb_count[pid]
+            ga = offsets[fa[pid]] + local // nb
+            gb = offsets[fb[pid]] + local % nb
+
+            # 1. 평행성 검사
+            va, vb = vec[ga], vec[gb]
+            dot = np.abs(va[:, 0]*vb[:, 0] + va[:, 1]*vb[:, 1] + va[:, 2]*vb[:, 2])
+            par = np.flatnonzero(dot >= (1.0 - self.norm_tol))
+            if len(par) == 0: continue
+            ia, ib, pid = ga[par], gb[par], pid[par]
+
+            # 2+3. 평행 쌍에 대해서만 eb.p1, eb.p2 를 ea 기준으로 함께 계산
+            u = vec[ia]
+            o = p1[ia]
+            d1 = p1[ib] - o
+            d2 = p2[ib] - o
+            ux, uy, uz = u[:, 0], u[:, 1], u[:, 2]
+            dx, dy, dz = d1[:, 0], d1[:, 1], d1[:, 2]
+            # 동일 직선 검사 (eb.p1 이 ea 직선 위에 있는지)
+            cx = dy*uz - dz*uy
+            cy = dz*ux - dx*uz
+            cz = dx*uy - dy*ux
+            collinear = (cx**2 + cy**2 + cz**2) < (self.point_tol**2)
+            # 구간 겹침 검사 (ea 방향으로 투영)
+            b1 = dx*ux + dy*uy + dz*uz
+            b2 = d2[:, 0]*ux + d2[:, 1]*uy + d2[:, 2]*uz
+            start = np.maximum(0.0, np.minimum(b1, b2))
+            end = np.minimum(length[ia], np.maximum(b1, b2))
+            touching[pid[collinear & ((end - start) > self.point_tol)]] = True
+        return touching
 
     def _extract_vertices(self, data):
         verts = []
-        sorted_keys = sorted([k for k in data.keys() if "vertex" in k.lower()])
+        # 표준 'Vertex_###' 키와 'x'/'X'가 없는 키는 lower() 없이 판별. JSON 순서가 이미 정렬되어 있으면 sort()는 선형 1회 확인으로 끝남
+        sorted_keys = [k for k in data if "Vertex" in k or (("x" in k or "X" in k) and "vertex" in k.lower())]
+        sorted_keys.sort()
         for k in sorted_keys:
             v = data[k]
             if isinstance(v, dict):
                 verts.append({'x': float(v.get('x',0)), 'y': float(v.get('y',0)), 'z': float(v.get('z',0))})
         return verts
 
+    def _collect_coords(self, data, coords: List[float]) -> None:
+        """_extract_vertices 와 같은 키 선택/순서로 x, y, z 좌표만 coords에 이어 붙입니다."""
+        sorted_keys = [k for k in data if "Vertex" in k or (("x" in k or "X" in k) and "vertex" in k.lower())]
+        sorted_keys.sort()
+        for k in sorted_keys:
+            v = data[k]
+            if isinstance(v, dict):
+                coords += (float(v.get('x',0)), float(v.get('y',0)), float(v.get('z',0)))
+
     def _calculate_normal(self, verts):
         sx, sy, sz = 0.0, 0.0, 0.0
-        n = len(verts)
-        for i in range(n):
-            c, nxt = verts[i], verts[(i+1)%n]
-            sx += (nxt['y']-c['y'])*(c['z']+nxt['z'])
-            sy += (nxt['z']-c['z'])*(c['x']+nxt['x'])
-            sz += (nxt['x']-c['x'])*(c['y']+nxt['y'])
+        # 직전 Vertex 좌표를 지역 변수로 넘겨 Vertex당 dict 조회 3회만 수행 (누적 순서는 동일)
+        c = verts[0]
+        cx, cy, cz = c['x'], c['y'], c['z']
+        for nxt in itertools.chain(itertools.islice(verts, 1, None), (c,)):
+            nx, ny, nz = nxt['x'], nxt['y'], nxt['z']
+            sx += (ny-cy)*(cz+nz)
+            sy += (nz-cz)*(cx+nx)
+            sz += (nx-cx)*(cy+ny)
+            cx, cy, cz = nx, ny, nz
         l = math.sqrt(sx**2 + sy**2 + sz**2)
         if l < 1e-9: return (0,1,0)
         return (sx/l, sy/l, sz/l)
 
+    def _calculate_normals_batch(self, V_list):
+        """
+        Vertex 개수가 같은 면끼리 (M,n,3) 배열로 묶어 Newell Normal을 일괄 계산합니다.
+        합산 순서는 _calculate_normal 과 동일하게 Vertex 순서대로 누적합니다.
+        """
+        normals = [None] * len(V_list)
+        by_count = defaultdict(list)
+        for idx, V in enumerate(V_list):
+            by_count[len(V)].append(idx)
+
+        for n, indices in by_count.items():
+            c = np.stack([V_list[i] for i in indices])
+            nxt = np.roll(c, -1, axis=1)
+            sx = np.zeros(len(indices))
+            sy = np.zeros(len(indices))
+            sz = np.zeros(len(indices))
+            for i in range(n):
+                sx += (nxt[:, i, 1]-c[:, i, 1])*(c[:, i, 2]+nxt[:, i, 2])
+                sy += (nxt[:, i, 2]-c[:, i, 2])*(c[:, i, 0]+nxt[:, i, 0])
+                sz += (nxt[:, i, 0]-c[:, i, 0])*(c[:, i, 1]+nxt[:, i, 1])
+            l = np.sqrt(sx**2 + sy**2 + sz**2)
+            for k, i in enumerate(indices):
+                if l[k] < 1e-9:
+                    normals[i] = (0,1,0)
+                else:
+                    normals[i] = (float(sx[k]/l[k]), float(sy[k]/l[k]), float(sz[k]/l[k]))
+        return normals
+
     def _group_by_plane(self, faces):
+        """
+        Normal을 양자화한 버킷 + 버킷 내부의 d 정렬(Sort-and-Sweep)로 동일 평면 후보를 찾습니다.
+        dot > 1 - norm_tol 이면 각 Normal 성분 차이는 sqrt(2 * norm_tol) 미만이므로,
+        인접(±1) Normal 버킷에서 |d_i - d_j| < dist_tol 구간만 조회해도 기존 O(N²) 비교와 동일한 결과를 얻습니다.
+        """
+        # 동일 평면 판정은 (N,3) Normal / (N,) d 배열에 대해 NumPy 연산으로 일괄 수행
+        normals = np.array([face['normal'] for face in faces], dtype=np.float64).reshape(-1, 3)
+        ds = np.array([face['d'] for face in faces], dtype=np.float64)
+        if len(faces) <= self.PLANE_DENSE_MAX_FACES:
+            return self._group_by_plane_dense(faces, normals, ds)
+
+        n_cell = math.sqrt(2.0 * self.norm_tol) + 1e-9
+        keys = [tuple(math.floor(c / n_cell) for c in face['normal']) for face in faces]
+        members = defaultdict(list)
+        for idx, key in enumerate(keys):
+            members[key].append(idx)
+        # 버킷별로 d 오름차순 정렬된 (d 배열, 면 인덱스 배열) 보관
+        buckets = {}
+        for key, idx_list in members.items():
+            idx_arr = np.array(idx_list)
+            order = np.argsort(ds[idx_arr], kind='stable')
+            buckets[key] = (ds[idx_arr][order], idx_arr[order])
+        neighbor_offsets = list(itertools.product((-1, 0, 1), repeat=3))
+
         groups = []
-        vis = [False]*len(faces)
+        vis = np.zeros(len(faces), dtype=bool)
         for i in range(len(faces)):
             if vis[i]: continue
             grp = [faces[i]]
             vis[i] = True
-            for j in range(i+1, len(faces)):
-                if vis[j]: continue
-                dot = sum(a*b for a,b in zip(faces[i]['normal'], faces[j]['normal']))
-                if dot > (1.0 - self.norm_tol) and abs(faces[i]['d'] - faces[j]['d']) < self.dist_tol:
+            kx, ky, kz = keys[i]
+            d_lo, d_hi = ds[i] - self.dist_tol, ds[i] + self.dist_tol
+            windows = []
+            for ox, oy, oz in neighbor_offsets:
+                bucket = buckets.get((kx+ox, ky+oy, kz+oz))
+                if bucket is None: continue
+                sorted_d, sorted_idx = bucket
+                lo, hi = np.searchsorted(sorted_d, d_lo, 'left'), np.searchsorted(sorted_d, d_hi, 'right')
+                if lo < hi: windows.append(sorted_idx[lo:hi])
+            if windows:
+                cand = np.concatenate(windows)
+                # 기존 순회 순서(j 오름차순)를 유지하기 위해 정렬
+                cand = np.sort(cand[(cand > i) & ~vis[cand]])
+                nx, ny, nz = faces[i]['normal']
+                dot = nx*normals[cand, 0] + ny*normals[cand, 1] + nz*normals[cand, 2]
+                coplanar = (dot > (1.0 - self.norm_tol)) & (np.abs(ds[i] - ds[cand]) < self.dist_tol)
+                for j in cand[coplanar].tolist():
                     grp.append(faces[j])
                     vis[j] = True
             groups.append(grp)
         return groups
 
+    def _group_by_plane_dense(self, faces, normals, ds):
+        """
+        작은 면 집합: (N,N) 동일 평면 행렬을 브로드캐스트 1회로 만든 뒤, 기존과 같은 순서로 그룹을 구성합니다.
+        (i 기준으로 아직 방문하지 않은 j > i 를 모두 묶는 방식이며, 전이적 연결은 하지 않음)
+        """
+        nx, ny, nz = normals[:, 0], normals[:, 1], normals[:, 2]
+        dot = nx[:, None]*nx[None, :] + ny[:, None]*ny[None, :] + nz[:, None]*nz[None, :]
+        coplanar = (dot > (1.0 - self.norm_tol)) & (np.abs(ds[:, None] - ds[None, :]) < self.dist_tol)
+
+        groups = []
+        vis = np.zeros(len(faces), dtype=bool)
+        for i in range(len(faces)):
+            if vis[i]: continue
+            vis[i] = True
+            members = np.flatnonzero(coplanar[i, i+1:] & ~vis[i+1:]) + (i + 1)
+            vis[members] = True
+            groups.append([faces[i]] + [faces[j] for j in members.tolist()])
+        return groups
+
     def _pt_to_tuple(self, pt):
         p = 3
         return (round(pt['x'], p), round(pt['y'], p), round(pt['z'], p))
@@ -1,6 +1,11 @@
 # src/processors/visualizers/batch_visualizer.py
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
 from src.config import Config
-from src.utils import JsonHandler, Log
+from src.utils import JsonHandler, Log, ResultCache
+from src.utils import file_manager
+from . import mesh_visualizer
 from .mesh_visualizer import MeshVisualizer
 
 class BatchVisualizer:
@@ -8,6 +13,14 @@ class BatchVisualizer:
     Output 디렉토리의 결과물들을 일괄적으로 로드하여 3D 그래프로 시각화합니다.
     """
 
+    def __init__(self, use_cache: bool = False, max_workers: Optional[int] = None):
+        # 결과 파일이 바뀌지 않았다면 이전 분석 결과(면/인접 그래프/색상)를 재사용하고 그리기만 수행 (pickle 캐시, 신뢰할 수 있는 출력 폴더에서만 사용)
+        self.use_cache = use_cache
+        # 시각화 모듈(분석 로직)과 JSON 읽기 모듈 소스가 수정되면 캐시 무효화
+        self.cache = ResultCache(Config.OUTPUT_DIR / Config.CACHE_DIR_NAME, "viz", (mesh_visualizer, file_manager))
+        # 분석 선행 처리 프로세스 수 (None이면 Config.DEFAULT_MAX_WORKERS, 그리기는 항상 메인 프로세스)
+        self.max_workers = max_workers or Config.DEFAULT_MAX_WORKERS
+
     def run(self):
         Log.section("Result Visualization Phase")
         
@@ -19,18 +32,68 @@ class BatchVisualizer:
             return
 
         print(f"총 {len(output_files)}개의 결과 파일을 순차적으로 시각화합니다.")
-        print("그래프 창을 닫으면 다음 파일이 표시됩니다.\n")
-
-        for filepath in output_files:
-            Log.info(f"Visualizing: {filepath.name}")
-            
-            data = JsonHandler.read_json(filepath)
-            if not data:
-                continue
+        # 창을 띄울 수 없는 Backend(MPL_BACKEND=Agg 등)이면 창 대신 PNG로 저장
+        plot_dir = Config.OUTPUT_DIR / Config.PLOT_DIR_NAME if MeshVisualizer.is_headless() else None
+        if plot_dir is not None:
+            plot_dir.mkdir(parents=True, exist_ok=True)
+            print(f"그래프를 {plot_dir} 에 이미지로 저장합니다.\n")
+        else:
+            print("그래프 창을 닫으면 다음 파일이 표시됩니다.\n")
+
+        cache_paths = {f: self.cache.path_for(f) for f in output_files} if self.use_cache else {}
+        cached = {f: self.cache.load(p) for f, p in cache_paths.items()}
+        pending = [f for f in output_files if cached.get(f) is None]
+
+        # 캐시에 없는 파일의 분석은 프로세스 풀에서 미리 수행하여, 사용자가 이전 그래프를 보는 동안 진행
+        workers = min(self.max_workers, len(pending))
+        executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+        futures = {f: executor.submit(_analyze_file_worker, f) for f in pending} if executor else {}
+
+        try:
+            for filepath in output_files:
+                Log.info(f"Visualizing: {filepath.name}")
                 
-            try:
-                # MeshVisualizer 실행 (창을 닫을 때까지 대기)
-                viz = MeshVisualizer(data)
-                viz.process()
-            except Exception as e:
-                Log.error(f"시각화 중 오류 발생 ({filepath.name}): {e}")
\ No newline at end of file
+                state = cached.get(filepath)
+                from_cache = state is not None
+                try:
+                    if state is None and filepath in futures:
+                        # 워커에서 모아 둔 분석 로그를 이 파일 차례에 출력
+                        state, file_log = futures[filepath].result()
+                        print(file_log, end='')
+                        if state is None:
+                            continue
+                    if state is not None:
+                        viz = MeshVisualizer.from_state(state)
+                    else:
+                        data = JsonHandler.read_json(filepath)
+                        if not data:
+                            continue
+                        viz = MeshVisualizer(data)
+                    
+                    # MeshVisualizer 실행 (창을 닫을 때까지 대기, headless면 저장 후 바로 다음 파일)
+                    viz.process(plot_dir / f"{filepath.stem}.png" if plot_dir is not None else None)
+                except Exception as e:
+                    Log.error(f"시각화 중 오류 발생 ({filepath.name}): {e}")
+                    continue
+
+                if filepath in cache_paths and not from_cache and viz.faces:
+                    self.cache.save(cache_paths[filepath], viz.export_state())
+        finally:
+            if executor:
+                executor.shutdown(cancel_futures=True)
+
+
+def _analyze_file_worker(filepath: Path) -> Tuple[Optional[Dict[str, Any]], str]:
+    """프로세스 풀 작업 단위. (분석 상태, 이 파일의 로그 출력)을 반환합니다. 로그는 메인 프로세스가 파일 순서대로 출력"""
+    return Log.run_buffered(_analyze_file, filepath)
+
+
+def _analyze_file(filepath: Path) -> Optional[Dict[str, Any]]:
+    """결과 파일을 읽어 그리기 직전까지 분석한 상태를 반환합니다. (그릴 면이 없으면 None)"""
+    data = JsonHandler.read_json(filepath)
+    if not data:
+        return None
+    viz = MeshVisualizer(data)
+    if not viz.analyze():
+        return None
+    return viz.export_state()
@@ -1,10 +1,13 @@
 # src/processors/visualizers/mesh_visualizer.py
+import matplotlib
 import matplotlib.pyplot as plt
 from mpl_toolkits.mplot3d.art3d import Poly3DCollection
 import numpy as np
-from typing import Dict, Any, List, Tuple
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
 from src.utils import Log
 import math
+import itertools
 
 class MeshVisualizer:
     """
@@ -14,45 +17,96 @@ class MeshVisualizer:
     """
     
     RAINBOW_COLORS = ['red', 'orange', 'yellow', 'green', 'blue', 'indigo', 'violet']
+    # 색상 이름 -> RGBA 행 (면 색상을 이름 리스트 대신 (F,4) 배열로 전달하기 위한 LUT, 마지막 행은 gray)
+    _COLOR_ROWS = dict(zip(RAINBOW_COLORS + ['gray'], itertools.count()))
+    _COLOR_RGBA = np.array(list(map(matplotlib.colors.to_rgba, RAINBOW_COLORS + ['gray'])))
+
+    # 분석 결과(그리기 직전 상태)로 저장/복원되는 속성
+    STATE_FIELDS = ("faces", "vert_ids", "vertex_array", "face_offsets", "normals", "adjacency", "colors")
+    # 면이 이 개수 이상일 때만 배열로 Normal 계산 (적으면 면별 루프가 더 빠름)
+    NORMAL_BATCH_MIN_FACES = 128
+    # 창을 띄우지 않는 Backend (MPL_BACKEND=Agg 또는 디스플레이가 없는 환경). 이때는 plt.show() 대신 파일로 저장
+    HEADLESS_BACKENDS = ("agg", "pdf", "ps", "svg", "pgf", "cairo", "template")
 
     def __init__(self, data: Dict[str, Any]):
         self.data = data
         self.faces = {}
+        # 면별 Vertex id 집합 (인접 판정용, 좌표 튜플 대신 정수 id로 비교)
+        self.vert_ids = {}
+        # 모든 면의 좌표를 면 순서대로 이어 붙인 (V,3) 배열과 면별 시작 위치 (F+1,) (CSR 형식)
+        # i번째 면의 좌표는 vertex_array[face_offsets[i]:face_offsets[i+1]]
+        self.vertex_array = np.empty((0, 3))
+        self.face_offsets = np.zeros(1, dtype=np.intp)
         self.normals = {} 
         self.adjacency = {}
         self.colors = {}
+        self._analyzed = False
+
+    @classmethod
+    def from_state(cls, state: Dict[str, Any]) -> "MeshVisualizer":
+        """export_state()로 저장한 분석 결과로부터 복원합니다. (파싱/인접 그래프/색상 계산 생략)"""
+        viz = cls({})
+        for name in cls.STATE_FIELDS:
+            setattr(viz, name, state[name])
+        viz._analyzed = True
+        return viz
+
+    def export_state(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.STATE_FIELDS}
 
-    def process(self):
+    @classmethod
+    def is_headless(cls) -> bool:
+        return matplotlib.get_backend().lower() in cls.HEADLESS_BACKENDS
+
+    def process(self, save_path: Optional[Path] = None):
+        """save_path가 주어지면 창을 띄우지 않고 이미지 파일로 저장합니다."""
         Log.section("Visualization Started")
         
+        if self._analyzed:
+            Log.info(f"Using pre-analyzed geometry ({len(self.faces)} faces).")
+        elif not self.analyze():
+            return
+
+        # 4. 시각화
+        self._plot_3d(save_path)
+
+    def analyze(self) -> bool:
+        """그리기 직전 단계(파싱, Normal, 인접 그래프, 색상)까지 수행합니다. 그릴 면이 없으면 False"""
         # 1. Geometry 파싱
         self._parse_geometry()
         
         if not self.faces:
             Log.warning("No geometry found to visualize.")
-            return
+            return False
             
         # 2. Normal Vector 직접 계산 (화살표 시각화용)
         self._calculate_all_normals()
         Log.info(f"Calculated normals for {len(self.normals)} faces.")
 
-        # 3. 그래프 생성 및 시각화
+        # 3. 그래프 생성
         self._build_adjacency_graph()
         self._assign_colors_greedy()
-        self._plot_3d()
+        self._analyzed = True
+        return True
 
     def _parse_geometry(self):
         def extract_vertices_from_dict(d: Dict) -> List[Tuple[float, float, float]]:
             vertices = []
-            sorted_keys = sorted([k for k in d.keys() if "vertex" in k.lower()])
+            # 표준 'Vertex_###' 키와 'x'/'X'가 없는 키는 lower() 없이 판별. JSON 순서가 이미 정렬되어 있으면 sort()는 선형 1회 확인으로 끝남
+            sorted_keys = [k for k in d if "Vertex" in k or (("x" in k or "X" in k) and "vertex" in k.lower())]
+            sorted_keys.sort()
             for k in sorted_keys:
                 v = d[k]
                 if isinstance(v, dict):
                     try:
                         vertices.append((float(v.get('x', 0)), float(v.get('y', 0)), float(v.get('z', 0))))
-                    except: pass
+                    except (TypeError, ValueError, OverflowError):
+                        pass  # 숫자로 변환할 수 없는 좌표(None, 문자열, 범위 초과 정수 등)의 Vertex는 건너뜀
             return vertices
 
+        # 좌표 튜플 -> 전역 정수 id
+        vid_map = {}
+
         for key, value in self.data.items():
             if not isinstance(value, dict): continue
 
@@ -60,16 +114,67 @@ class MeshVisualizer:
                 verts = extract_vertices_from_dict(v)
                 if verts and len(verts) >= 3:
                     self.faces[k] = verts
+                    self.vert_ids[k] = frozenset([vid_map.setdefault(p, len(vid_map)) for p in verts])
 
             process_face(key, value)
             for sub_key, sub_value in value.items():
                 if isinstance(sub_value, dict):
                     process_face(sub_key, sub_value)
 
+        self._build_vertex_array()
+
+    def _build_vertex_array(self):
+        """self.faces (최종 순서 기준)의 좌표를 vertex_array / face_offsets 로 한 번만 평탄화합니다."""
+        counts = np.fromiter(map(len, self.faces.values()), dtype=np.intp, count=len(self.faces))
+        self.face_offsets = np.zeros(len(counts) + 1, dtype=np.intp)
+        np.cumsum(counts, out=self.face_offsets[1:])
+        coords = itertools.chain.from_iterable(itertools.chain.from_iterable(self.faces.values()))
+        self.vertex_array = np.fromiter(coords, dtype=np.float64, count=3 * int(self.face_offsets[-1])).reshape(-1, 3)
+
+    def _face_block(self, rows, n: int) -> np.ndarray:
+        """Vertex 개수가 n인 면들(면 순서 번호 rows)의 좌표를 (M,n,3) 배열로 반환합니다."""
+        return self.vertex_array[self.face_offsets[rows][:, None] + np.arange(n)]
+
     def _calculate_all_normals(self):
-        """모든 면에 대해 Normal Vector를 계산합니다."""
-        for face_id, verts in self.faces.items():
-            self.normals[face_id] = self._calculate_single_normal(verts)
+        """
+        모든 면에 대해 Normal Vector를 계산합니다.
+        면이 충분히 많으면 vertex_array 전체에서 Vertex별 Newell 항을 한 번에 계산한 뒤,
+        면 안의 Vertex 순서대로 누적합니다. (합산 순서는 _calculate_single_normal 과 동일)
+        """
+        counts = np.diff(self.face_offsets)
+        if len(counts) < self.NORMAL_BATCH_MIN_FACES or counts.min() < 3:
+            for face_id, verts in self.faces.items():
+                self.normals[face_id] = self._calculate_single_normal(verts)
+            return
+
+        V = self.vertex_array
+        starts = self.face_offsets[:-1]
+        # 각 Vertex의 다음 Vertex 번호 (면의 마지막 Vertex는 같은 면의 첫 Vertex로 순환)
+        next_idx = np.arange(1, len(V) + 1)
+        next_idx[self.face_offsets[1:] - 1] = starts
+        N = V[next_idx]
+        terms = np.empty_like(V)
+        terms[:, 0] = (N[:, 1] - V[:, 1]) * (V[:, 2] + N[:, 2])
+        terms[:, 1] = (N[:, 2] - V[:, 2]) * (V[:, 0] + N[:, 0])
+        terms[:, 2] = (N[:, 0] - V[:, 0]) * (V[:, 1] + N[:, 1])
+
+        # Vertex 개수 내림차순으로 면을 정렬하면, i번째 Vertex를 가진 면은 항상 앞쪽 active[i]개
+        order = np.argsort(-counts, kind='stable')
+        sorted_starts = starts[order]
+        max_n = int(counts.max())
+        active = np.searchsorted(-counts[order], -np.arange(max_n), side='left').tolist()
+        sums = np.zeros((len(order), 3))
+        for i in range(max_n):
+            k = active[i]
+            sums[:k] += terms[sorted_starts[:k] + i]
+
+        # 결과 dict의 순서는 면 순서를 유지
+        self.normals.update(dict.fromkeys(self.faces))
+        face_ids = list(self.faces)
+        # 정규화는 면별 스칼라로 수행 (float ** 2 는 NumPy 제곱과 마지막 비트가 다를 수 있음)
+        for row, (sx, sy, sz) in zip(order.tolist(), sums.tolist()):
+            length = math.sqrt(sx**2 + sy**2 + sz**2)
+            self.normals[face_ids[row]] = (0.0, 1.0, 0.0) if length < 1e-9 else (sx / length, sy / length, sz / length)
 
     def _calculate_single_normal(self, verts: List[Tuple[float, float, float]]) -> Tuple[float, float, float]:
         """C# CalculateNormal 메서드 논리 구현"""
@@ -79,14 +184,14 @@ class MeshVisualizer:
 
         sum_x, sum_y, sum_z = 0.0, 0.0, 0.0
 
-        for i in range(n):
-            curr = verts[i]
-            next_v = verts[(i + 1) % n]
-
+        # 직전 Vertex 좌표를 지역 변수로 넘겨 Vertex마다 한 번만 언패킹 (누적 순서는 동일)
+        cx, cy, cz = verts[0]
+        for nx, ny, nz in verts[1:] + verts[:1]:
             # C# Logic: (next - current) * (sum)
-            sum_x += (next_v[1] - curr[1]) * (curr[2] + next_v[2])
-            sum_y += (next_v[2] - curr[2]) * (curr[0] + next_v[0])
-            sum_z += (next_v[0] - curr[0]) * (curr[1] + next_v[1])
+            sum_x += (ny - cy) * (cz + nz)
+            sum_y += (nz - cz) * (cx + nx)
+            sum_z += (nx - cx) * (cy + ny)
+            cx, cy, cz = nx, ny, nz
 
         length = math.sqrt(sum_x**2 + sum_y**2 + sum_z**2)
         if length < 1e-9:
@@ -96,51 +201,85 @@ class MeshVisualizer:
 
     def _build_adjacency_graph(self):
         face_ids = list(self.faces.keys())
-        n = len(face_ids)
         for fid in face_ids:
             self.adjacency[fid] = set()
-        for i in range(n):
-            for j in range(i + 1, n):
-                id_a, id_b = face_ids[i], face_ids[j]
-                if len(set(self.faces[id_a]).intersection(set(self.faces[id_b]))) >= 2:
-                    self.adjacency[id_a].add(id_b)
-                    self.adjacency[id_b].add(id_a)
+        if len(face_ids) < 2:
+            return
+        # (Vertex id, 면 번호) 쌍을 Vertex id 순으로 안정 정렬 -> 같은 Vertex를 가진 면들이 면 번호 오름차순으로 연속
+        counts = np.fromiter((len(self.vert_ids[fid]) for fid in face_ids), dtype=np.int64, count=len(face_ids))
+        vids = np.fromiter(itertools.chain.from_iterable(self.vert_ids[fid] for fid in face_ids), dtype=np.int64, count=int(counts.sum()))
+        order = np.argsort(vids, kind='stable')
+        vids = vids[order]
+        owners = np.repeat(np.arange(len(face_ids), dtype=np.int64), counts)[order]
+        # 같은 Vertex를 공유하는 면 쌍 (i < j)을 정수 하나(i * F + j)로 묶어 수집 (전체 N² 쌍 비교 제거)
+        pair_keys = []
+        d = 1
+        while d < len(vids):
+            same = vids[d:] == vids[:-d]
+            if not same.any():
+                break
+            pair_keys.append(owners[:-d][same] * len(face_ids) + owners[d:][same])
+            d += 1
+        if not pair_keys:
+            return
+        # 2개 이상의 Vertex를 공유하는 쌍을 인접으로 판정
+        keys, shared_count = np.unique(np.concatenate(pair_keys), return_counts=True)
+        keys = keys[shared_count >= 2]
+        for i, j in zip((keys // len(face_ids)).tolist(), (keys % len(face_ids)).tolist()):
+            id_a, id_b = face_ids[i], face_ids[j]
+            self.adjacency[id_a].add(id_b)
+            self.adjacency[id_b].add(id_a)
 
     def _assign_colors_greedy(self):
         sorted_faces = sorted(self.faces.keys(), key=lambda k: len(self.adjacency[k]), reverse=True)
+        # 면별 색상을 RAINBOW_COLORS 인덱스 비트로 기록 (gray는 0). 이웃 비트를 OR 한 뒤 가장 낮은 빈 비트를 선택
+        all_bits = (1 << len(self.RAINBOW_COLORS)) - 1
+        color_bits = {}
         for face_id in sorted_faces:
-            neighbor_colors = {self.colors[n] for n in self.adjacency[face_id] if n in self.colors}
-            found = next((c for c in self.RAINBOW_COLORS if c not in neighbor_colors), 'gray')
-            self.colors[face_id] = found
+            used = 0
+            for n in self.adjacency[face_id]:
+                used |= color_bits.get(n, 0)
+            free = all_bits & ~used
+            bit = free & -free
+            color_bits[face_id] = bit
+            self.colors[face_id] = self.RAINBOW_COLORS[bit.bit_length() - 1] if bit else 'gray'
+
+    def _face_centers(self, rows: np.ndarray) -> np.ndarray:
+        """면 순서 번호 rows 순서대로 면 중심점 (F,3) 배열을 반환합니다. Vertex 개수가 같은 면끼리 묶어 평균을 계산합니다."""
+        centers = np.empty((len(rows), 3))
+        counts = np.diff(self.face_offsets)[rows]
+        for n in np.unique(counts).tolist():
+            sel = counts == n
+            centers[sel] = self._face_block(rows[sel], n).mean(axis=1)
+        return centers
 
-    def _plot_3d(self):
+    def _plot_3d(self, save_path: Optional[Path] = None):
         fig = plt.figure(figsize=(10, 8))
         ax = fig.add_subplot(111, projection='3d')
         
-        polygons = []
-        face_colors = []
+        # 1. Mesh Plot (Unity to Plot: x, z, y)
+        # 면별 튜플 리스트 대신 vertex_array의 축을 한 번에 바꾸고, 면별 구간을 뷰로 전달
+        # (모든 면의 Vertex 개수가 같으면 (F,n,3) 배열 하나로 전달)
+        visual_verts = self.vertex_array[:, [0, 2, 1]]
+        counts = np.diff(self.face_offsets)
+        if len(counts) and (counts == counts[0]).all():
+            polygons = visual_verts.reshape(len(counts), int(counts[0]), 3)
+        else:
+            polygons = np.split(visual_verts, self.face_offsets[1:-1])
+        color_rows = self._COLOR_ROWS
+        face_colors = self._COLOR_RGBA[[color_rows[self.colors.get(face_id, 'gray')] for face_id in self.faces]]
 
-        for face_id, verts in self.faces.items():
-            # 1. Mesh Plot (Unity to Plot: x, z, y)
-            visual_verts = [(v[0], v[2], v[1]) for v in verts]
-            polygons.append(visual_verts)
-            
-            face_colors.append(self.colors.get(face_id, 'gray'))
-
-            # 2. Normal Vector Plot (화살표 그리기)
-            if face_id in self.normals:
-                nx, ny, nz = self.normals[face_id]
-                
-                # 중심점 (Unity to Plot)
-                orig_verts = np.array(verts)
-                center = orig_verts.mean(axis=0)
-                sx, sy, sz = center[0], center[2], center[1]
-                
-                # 방향 (Unity to Plot)
-                dx, dy, dz = nx, nz, ny
-                
-                ax.quiver(sx, sy, sz, dx, dy, dz,
-                          length=0.25, color='black', linewidth=1.0, arrow_length_ratio=0.3)
+        # 2. Normal Vector Plot (화살표 그리기)
+        # 면마다 quiver를 호출하지 않고 모아서 한 번에 그림 (Artist 1개). 중심점도 Vertex 개수별로 일괄 계산
+        arrow_rows = [row for row, face_id in enumerate(self.faces) if face_id in self.normals]
+        if arrow_rows:
+            face_ids = list(self.faces)
+            arrow_ids = [face_ids[row] for row in arrow_rows]
+            # 중심점 / 방향 (Unity to Plot: x, z, y)
+            sx, sz, sy = self._face_centers(np.array(arrow_rows, dtype=np.intp)).T
+            dx, dz, dy = np.array([self.normals[face_id] for face_id in arrow_ids], dtype=np.float64).T
+            ax.quiver(sx, sy, sz, dx, dy, dz,
+                      length=0.25, color='black', linewidth=1.0, arrow_length_ratio=0.3)
 
         # Poly3DCollection 생성
         poly_collection = Poly3DCollection(polygons, alpha=0.6, edgecolor='gray', linewidths=0.5)
@@ -148,18 +287,25 @@ class MeshVisualizer:
         ax.add_collection3d(poly_collection)
 
         # 축 범위 설정
-        all_visual_verts = [v for poly in polygons for v in poly]
-        if all_visual_verts:
-            arr = np.array(all_visual_verts)
+        if self.faces:
+            # 파싱 시 만든 vertex_array 재사용 (Unity to Plot: x, z, y)
+            arr = self.vertex_array
             ax.set_xlim(arr[:,0].min(), arr[:,0].max())
-            ax.set_ylim(arr[:,1].min(), arr[:,1].max())
-            ax.set_zlim(arr[:,2].min(), arr[:,2].max())
+            ax.set_ylim(arr[:,2].min(), arr[:,2].max())
+            ax.set_zlim(arr[:,1].min(), arr[:,1].max())
 
         ax.set_xlabel('Unity X')
         ax.set_ylabel('Unity Z (Depth)')
         ax.set_zlabel('Unity Y (Height)')
         ax.set_title(f'3D Mesh Visualization ({len(self.faces)} faces)')
 
-    
-
-        plt.show()
\ No newline at end of file
+        if save_path is not None:
+            fig.savefig(save_path)
+            plt.close(fig)
+            Log.success(f"Saved: {save_path.name}")
+        elif self.is_headless():
+            # 창을 띄울 수 없는 Backend에서는 show()가 아무것도 하지 않으므로 Figure만 정리
+            Log.warning("Non-interactive backend; pass save_path to keep the plot.")
+            plt.close(fig)
+        else:
+            plt.show()
\ No newline at end of file
@@ -12,21 +12,27 @@ Utilities Package
 
 2. logger.py
    - Log: ANSI Escape Code를 활용한 컬러 콘솔 로깅 (Info, Success, Error, Warning, Trace 등).
+     LOG_LEVEL 환경 변수(TRACE/PERF/INFO)로 Trace, Perf 출력 여부를 제어.
 
 3. decorators.py
    - measure_time: 함수 실행 시간 측정 및 성능 로깅.
    - log_lifecycle: 함수 호출의 시작과 끝을 추적(Trace)하여 로깅.
+
+4. result_cache.py
+   - ResultCache: 원본 파일별 처리 결과 pickle 캐시 (키 생성, 로드/저장, 이전 캐시 정리).
 """
 
 # 패키지 레벨에서 바로 접근 가능하도록 주요 클래스/함수 노출 (Convenience Imports)
 from .file_manager import JsonHandler
 from .logger import Log
 from .decorators import measure_time, log_lifecycle
+from .result_cache import ResultCache
 
 # 'from src.utils import *' 사용 시 노출될 항목 정의
 __all__ = [
     "JsonHandler",
     "Log", 
     "measure_time", 
-    "log_lifecycle"
+    "log_lifecycle",
+    "ResultCache"
 ]
\ No newline at end of file
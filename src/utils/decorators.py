@@ -6,6 +6,10 @@ from typing import Callable, Any
 from src.utils.logger import Log 
 
 def measure_time(func: Callable) -> Callable:
+    # Perf 출력이 꺼져 있으면 래퍼 없이 원본 함수를 그대로 사용 (호출마다 시간 측정/로그 생략)
+    if not Log.PERF_ENABLED:
+        return func
+
     @functools.wraps(func)
     def wrapper(*args, **kwargs) -> Any:
         start_time = time.perf_counter()
@@ -19,6 +23,10 @@ def measure_time(func: Callable) -> Callable:
     return wrapper
 
 def log_lifecycle(func: Callable) -> Callable:
+    # Trace 출력이 꺼져 있으면 래퍼 없이 원본 함수를 그대로 사용
+    if not Log.TRACE_ENABLED:
+        return func
+
     @functools.wraps(func)
     def wrapper(*args, **kwargs) -> Any:
         class_name = ""
@@ -1,20 +1,33 @@
 # src/utils/file_manager.py
 
 import json
+import math
 import re
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Union
 from src.utils.logger import Log  
 
+try:
+    import orjson  # 설치된 경우 대용량 JSON 파싱 가속
+except ImportError:
+    orjson = None
+
 class JsonHandler:
+    # 닫는 괄호 앞의 trailing comma 제거 (',}' 와 ',]' 를 한 번의 스캔으로 처리)
+    _TRAILING_COMMA_RE = re.compile(r',\s*([}\]])')
+
     @staticmethod
     def read_json(filepath: Path) -> Dict[str, Any]:
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                content = f.read()
-            content = re.sub(r',\s*}', '}', content)
-            content = re.sub(r',\s*]', ']', content)
-            return json.loads(content)
+            # 바이트로 읽어 파서에 그대로 전달 (orjson은 UTF-8 바이트를 직접 파싱하므로 str 디코딩 생략)
+            with open(filepath, 'rb') as f:
+                raw = f.read()
+            try:
+                return JsonHandler._loads(raw)
+            except json.JSONDecodeError:
+                # 표준 JSON으로 읽히지 않을 때만 trailing comma를 제거하고 재시도
+                content = JsonHandler._TRAILING_COMMA_RE.sub(r'\1', raw.decode('utf-8'))
+                return JsonHandler._loads(content)
         except json.JSONDecodeError as e:
             Log.error(f"JSON parsing failed ({filepath.name}): {e}")
             return {}
@@ -22,11 +35,57 @@ class JsonHandler:
             Log.error(f"Unexpected error reading ({filepath.name}): {e}")
             return {}
 
+    @staticmethod
+    def _loads(content: Union[str, bytes]) -> Dict[str, Any]:
+        if orjson is not None:
+            try:
+                return orjson.loads(content)
+            except orjson.JSONDecodeError:
+                pass  # NaN 등 orjson 미지원 표기는 표준 json으로 재시도
+        return json.loads(content)
+
     @staticmethod
     def save_json(filepath: Path, data: Dict[str, Any]) -> None:
         try:
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            with open(filepath, 'wb') as f:
+                f.write(JsonHandler._dumps(data))
             Log.success(f"Saved: {filepath.name}")
         except Exception as e:
-            Log.error(f"Failed to save ({filepath.name}): {e}")
\ No newline at end of file
+            Log.error(f"Failed to save ({filepath.name}): {e}")
+
+    @staticmethod
+    def _dumps(data: Dict[str, Any]) -> bytes:
+        if orjson is not None:
+            try:
+                # NumPy 스칼라(병합 결과 좌표 등)도 직렬화, 출력 형식은 indent=2 와 동일
+                out = orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+                # orjson은 NaN/Infinity를 null로 바꾸므로, 그런 값이 있으면 표준 json(NaN/Infinity 그대로 기록)으로 재직렬화
+                if b'null' not in out or not JsonHandler._has_non_finite(data):
+                    return out
+            except orjson.JSONEncodeError:
+                pass  # orjson 미지원 타입은 표준 json으로 재시도
+        return json.dumps(data, indent=2, ensure_ascii=False, default=JsonHandler._numpy_default).encode('utf-8')
+
+    @staticmethod
+    def _numpy_default(v: Any) -> Any:
+        """표준 json 재직렬화 시 NumPy 스칼라/배열을 Python 값으로 변환"""
+        if hasattr(v, 'tolist'):
+            return v.tolist()
+        raise TypeError(f"Object of type {type(v).__name__} is not JSON serializable")
+
+    @staticmethod
+    def _has_non_finite(data: Any) -> bool:
+        """data 안에 NaN/Infinity 실수(NumPy 스칼라/배열 포함)가 있는지 확인합니다."""
+        stack = [data]
+        while stack:
+            v = stack.pop()
+            if isinstance(v, dict):
+                stack.extend(v.values())
+            elif isinstance(v, (list, tuple)):
+                stack.extend(v)
+            elif isinstance(v, float):
+                if not math.isfinite(v):
+                    return True
+            elif hasattr(v, 'tolist'):
+                stack.append(v.tolist())  # NumPy 스칼라/배열 -> Python 값
+        return False
@@ -1,11 +1,22 @@
 # src/utils/logger.py
 
+import contextlib
+import io
+import os
+from typing import Any, Callable, Tuple
+
+# 출력 수준: TRACE(기본, 모두 출력) / PERF(Trace 생략) / INFO(Trace, Perf 생략)
+_LOG_LEVELS = ("TRACE", "PERF", "INFO")
+_REQUESTED_LOG_LEVEL = (os.getenv("LOG_LEVEL") or "TRACE").strip().upper()
+# 알 수 없는 값은 TRACE로 처리 (모듈 끝에서 경고 출력)
+_LOG_LEVEL = _REQUESTED_LOG_LEVEL if _REQUESTED_LOG_LEVEL in _LOG_LEVELS else "TRACE"
+
 class Log:
     """
     Console Logger with Colors using ANSI Escape Codes.
     Standard output wrapper for better visibility in VS Code terminal.
     """
-    
+
     # ANSI Colors
     HEADER = '\033[95m'      # Purple
     BLUE = '\033[94m'        # Blue
@@ -17,37 +28,73 @@ class Log:
     UNDERLINE = '\033[4m'    # Underline
     RESET = '\033[0m'        # Reset to default
 
+    # 레벨별 접두어 (호출마다 색상 + 태그를 다시 조합하지 않도록 미리 결합)
+    _INFO = "  [Info] "
+    _TRACE = CYAN + "  [Trace] "
+    _SUCCESS = GREEN + "[Success] "
+    _WARNING = WARNING + "[Warning] "
+    _ERROR = FAIL + "  [Error] "
+    _PERF = HEADER + "  [Perf]  "
+    _SECTION = "\n" + BLUE + BOLD + "=== "
+    _SECTION_END = " ===" + RESET
+
+    # LOG_LEVEL 환경 변수로 Trace/Perf 출력 여부 결정 (데코레이터도 이 값을 참조)
+    TRACE_ENABLED = _LOG_LEVEL == "TRACE"
+    PERF_ENABLED = _LOG_LEVEL in ("TRACE", "PERF")
+
     @staticmethod
     def info(msg: str):
         """General information (White/Default)"""
-        print(f"  [Info] {msg}")
+        print(Log._INFO + msg)
 
     @staticmethod
     def trace(msg: str):
         """Lifecycle tracing (Cyan)"""
-        print(f"{Log.CYAN}  [Trace] {msg}{Log.RESET}")
+        if Log.TRACE_ENABLED:
+            print(Log._TRACE + msg + Log.RESET)
 
     @staticmethod
     def success(msg: str):
         """Success messages (Green)"""
-        print(f"{Log.GREEN}[Success] {msg}{Log.RESET}")
+        print(Log._SUCCESS + msg + Log.RESET)
 
     @staticmethod
     def warning(msg: str):
         """Warning messages (Yellow)"""
-        print(f"{Log.WARNING}[Warning] {msg}{Log.RESET}")
+        print(Log._WARNING + msg + Log.RESET)
 
     @staticmethod
     def error(msg: str):
         """Error messages (Red)"""
-        print(f"{Log.FAIL}  [Error] {msg}{Log.RESET}")
-    
+        print(Log._ERROR + msg + Log.RESET)
+
     @staticmethod
     def performance(msg: str):
         """Performance metrics (Purple)"""
-        print(f"{Log.HEADER}  [Perf]  {msg}{Log.RESET}")
+        if Log.PERF_ENABLED:
+            print(Log._PERF + msg + Log.RESET)
 
     @staticmethod
     def section(msg: str):
         """Section Divider (Bold Blue)"""
-        print(f"\n{Log.BLUE}{Log.BOLD}=== {msg} ==={Log.RESET}")
\ No newline at end of file
+        print(Log._SECTION + msg + Log._SECTION_END)
+
+    @staticmethod
+    def run_buffered(func: Callable[..., Any], *args: Any) -> Tuple[Any, str]:
+        """
+        func(*args)의 콘솔 출력을 모아 (반환값, 출력 문자열)로 돌려줍니다.
+        병렬 작업의 로그가 섞이지 않도록 메인 프로세스에서 파일 단위로 출력할 때 사용합니다.
+        예외 발생 시에는 모은 출력을 바로 내보낸 뒤 예외를 다시 발생시킵니다.
+        """
+        buf = io.StringIO()
+        try:
+            with contextlib.redirect_stdout(buf):
+                result = func(*args)
+        except BaseException:
+            print(buf.getvalue(), end='')
+            raise
+        return result, buf.getvalue()
+
+
+if _LOG_LEVEL != _REQUESTED_LOG_LEVEL:
+    Log.warning(f"Unknown LOG_LEVEL '{_REQUESTED_LOG_LEVEL}', falling back to TRACE (expected one of {'/'.join(_LOG_LEVELS)}).")
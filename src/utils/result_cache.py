@@ -0,0 +1,61 @@
+# src/utils/result_cache.py
+
+import hashlib
+import pickle
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Iterable, Optional
+from .logger import Log
+
+class ResultCache:
+    """
+    원본 파일별 처리 결과를 pickle 파일로 저장/재사용하는 캐시.
+    키: (원본 경로, 수정 시각, 크기, 호출 측 설정값, 처리 로직 모듈 소스 수정 시각)
+    -> 입력 파일이나 로직 소스가 수정되면 자동으로 무효화되고, 저장 시 같은 원본의 이전 캐시 파일은 삭제합니다.
+
+    [주의] pickle.load는 파일 내용에 따라 임의 코드를 실행할 수 있습니다.
+    캐시 폴더는 직접 생성한 신뢰할 수 있는 로컬 경로로만 사용하세요.
+    """
+
+    def __init__(self, cache_dir: Path, tag: str, source_modules: Iterable[ModuleType]):
+        self.cache_dir = cache_dir
+        # 같은 폴더를 쓰는 다른 캐시(변환/시각화)와 파일명을 구분하는 태그
+        self.tag = tag
+        self.source_paths = [Path(m.__file__) for m in source_modules]
+
+    def path_for(self, filepath: Path, *settings: Any) -> Path:
+        stat = filepath.stat()
+        code_mtimes = [p.stat().st_mtime_ns for p in self.source_paths]
+        raw_key = f"{filepath.resolve()}|{stat.st_mtime_ns}|{stat.st_size}|{settings!r}|{code_mtimes}"
+        key = hashlib.blake2b(raw_key.encode("utf-8"), digest_size=16).hexdigest()
+        return self.cache_dir / f"{filepath.stem}_{self.tag}_{key}.pkl"
+
+    def load(self, cache_path: Path) -> Optional[Any]:
+        if not cache_path.exists():
+            return None
+        try:
+            with open(cache_path, 'rb') as f:
+                return pickle.load(f)
+        except Exception as e:
+            Log.warning(f"Failed to load cache ({cache_path.name}): {e}")
+            return None
+
+    def save(self, cache_path: Path, value: Any) -> None:
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(cache_path, 'wb') as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            Log.warning(f"Failed to save cache ({cache_path.name}): {e}")
+            return
+        self._prune(cache_path)
+
+    def _prune(self, keep: Path) -> None:
+        """keep과 같은 원본/태그의 이전 캐시 파일 삭제 (키는 16진수라 '_'가 없으므로 마지막 '_' 앞부분이 같은 파일만 대상)"""
+        prefix = keep.stem.rsplit('_', 1)[0]
+        for old in keep.parent.glob("*.pkl"):
+            if old != keep and old.stem.rsplit('_', 1)[0] == prefix:
+                try:
+                    old.unlink()
+                except OSError as e:
+                    Log.warning(f"Failed to remove stale cache ({old.name}): {e}")